@@ -14,6 +14,7 @@ from app.playlist import list_playlists
 from app.tree import load_tree
 from app.chat_tools import (
     tools_for_anthropic, tools_for_openai, execute_tool, CHAT_TOOLS,
+    _TREE_FILES,
 )
 
 log = logging.getLogger(__name__)
@@ -21,13 +22,6 @@ log = logging.getLogger(__name__)
 MAX_TOOL_LOOPS = 10
 MAX_HISTORY_MESSAGES = 40
 
-_TREE_FILES = {
-    "genre": "output/collection_tree.json",
-    "scene": "output/scene_tree.json",
-    "collection": "output/curated_collection.json",
-}
-
-
 # ---------------------------------------------------------------------------
 # System prompt
 # ---------------------------------------------------------------------------
@@ -94,6 +88,13 @@ def build_chat_system_prompt(state):
 # History management
 # ---------------------------------------------------------------------------
 
+def _append_history(state, history, message):
+    """Append to the conversation and bump ``state["chat_rev"]``, the
+    revision counter the history endpoint's ETag is built from."""
+    history.append(message)
+    state["chat_rev"] = state.get("chat_rev", 0) + 1
+
+
 def _trim_history(history):
     """Trim conversation history to keep context manageable."""
     if len(history) <= MAX_HISTORY_MESSAGES:
@@ -278,7 +279,7 @@ def run_chat_turn(state, user_message, broadcast_fn, stop_flag,
     history = state.setdefault("chat_history", [])
 
     # Append user message
-    history.append({"role": "user", "content": user_message})
+    _append_history(state, history, {"role": "user", "content": user_message})
 
     # Load config
     config = load_config_fn() if load_config_fn else {}
@@ -316,7 +317,7 @@ def run_chat_turn(state, user_message, broadcast_fn, stop_flag,
                 )
 
                 # Append assistant message to history
-                history.append({"role": "assistant", "content": content_blocks})
+                _append_history(state, history, {"role": "assistant", "content": content_blocks})
 
                 if stop_reason == "tool_use":
                     # Process tool calls
@@ -346,7 +347,7 @@ def run_chat_turn(state, user_message, broadcast_fn, stop_flag,
                             })
 
                     # Append tool results as user message
-                    history.append({"role": "user", "content": tool_result_blocks})
+                    _append_history(state, history, {"role": "user", "content": tool_result_blocks})
                     trimmed = _trim_history(history)
                     continue
                 else:
@@ -368,7 +369,7 @@ def run_chat_turn(state, user_message, broadcast_fn, stop_flag,
 
                 # Convert back to Anthropic-native format for history
                 anthropic_content = _openai_msg_to_anthropic(message)
-                history.append({"role": "assistant", "content": anthropic_content})
+                _append_history(state, history, {"role": "assistant", "content": anthropic_content})
 
                 if finish_reason == "tool_calls" and message.get("tool_calls"):
                     tool_result_blocks = []
@@ -402,7 +403,7 @@ def run_chat_turn(state, user_message, broadcast_fn, stop_flag,
                             "content": json.dumps(result),
                         })
 
-                    history.append({"role": "user", "content": tool_result_blocks})
+                    _append_history(state, history, {"role": "user", "content": tool_result_blocks})
                     trimmed = _trim_history(history)
                     continue
                 else:
@@ -20,16 +20,18 @@ from app.playlist import (
     create_playlist as _create_playlist,
     add_tracks_to_playlist as _add_tracks_to_playlist,
 )
-from app.tree import load_tree, find_node
+from app.tree import (
+    load_tree, find_node, TREE_PROFILES, _TREE_FILE, _COLLECTION_TREE_FILE,
+)
 from app.setbuilder import list_saved_sets as _list_saved_sets
 
 log = logging.getLogger(__name__)
 
-# Tree file paths (same as tree.py / routes.py)
+# Tree file paths (resolved by tree.py against the shared OUTPUT_DIR)
 _TREE_FILES = {
-    "genre": "output/collection_tree.json",
-    "scene": "output/scene_tree.json",
-    "collection": "output/curated_collection.json",
+    "genre": _TREE_FILE,
+    "scene": TREE_PROFILES["scene"]["file"],
+    "collection": _COLLECTION_TREE_FILE,
 }
 
 
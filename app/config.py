@@ -1,7 +1,14 @@
+import functools
 import json
 import os
 
-CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config.json")
+# Resolved once at import so path helpers never depend on the CWD.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config.json")
+
+# Single home for persisted state (JSON stores, autosave CSVs, artwork).
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 
 DEFAULT_SYSTEM_PROMPT = "You are a music genre expert and DJ selector."
 
@@ -23,21 +30,36 @@ DEFAULT_CONFIG = {
     "model": "claude-sonnet-4-5-20250929",
     "system_prompt": DEFAULT_SYSTEM_PROMPT,
     "user_prompt_template": DEFAULT_USER_PROMPT_TEMPLATE,
-    "delay_between_requests": 1.5,
+    "delay_between_requests": 1.5,  # minimum spacing between bulk-tagging request starts
+    "tag_concurrency": 4,  # bulk-tagging requests allowed in flight at once
     "audio_path_map_enabled": False,
     "audio_path_from": "/Volumes/Macintosh HD/Users/jasonfurnell/Dropbox",
     "audio_path_to": "/Users/jason.furnell/Dropbox (Personal)",
     "dropbox_path_prefix": "",  # prefix to strip from CSV location to get Dropbox path; empty = use audio_path_from
+    "autosave_gzip": False,  # write output/<name>_autosave.csv.gz (fast gzip) instead of plain CSV
 }
 
 
-def load_config():
+# Bumped by save_config(); keys the cached read so hot paths (audio path
+# mapping runs on every range request) don't re-read config.json.
+_config_generation = 0
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config(generation):
     if os.path.exists(CONFIG_PATH):
         with open(CONFIG_PATH) as f:
             return {**DEFAULT_CONFIG, **json.load(f)}
     return dict(DEFAULT_CONFIG)
 
 
+def load_config():
+    # Callers mutate the result (e.g. update_config), so hand out a copy
+    return dict(_read_config(_config_generation))
+
+
 def save_config(config_dict):
+    global _config_generation
     with open(CONFIG_PATH, "w") as f:
         json.dump(config_dict, f, indent=2)
+    _config_generation += 1
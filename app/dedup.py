@@ -10,9 +10,9 @@ import os
 
 import pandas as pd
 
-log = logging.getLogger(__name__)
+from app.config import OUTPUT_DIR
 
-_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+log = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
@@ -161,7 +161,7 @@ def _remap_id_list(ids, remap):
 
 def remap_playlists(remap):
     """Remap track IDs in playlists.json. Returns (data, changed_count)."""
-    path = os.path.join(_OUTPUT_DIR, "playlists.json")
+    path = os.path.join(OUTPUT_DIR, "playlists.json")
     if not os.path.exists(path):
         return None, 0
 
@@ -183,7 +183,7 @@ def remap_playlists(remap):
 
 def remap_saved_sets(remap):
     """Remap track IDs in saved_sets.json. Returns (data, changed_count)."""
-    path = os.path.join(_OUTPUT_DIR, "saved_sets.json")
+    path = os.path.join(OUTPUT_DIR, "saved_sets.json")
     if not os.path.exists(path):
         return None, 0
 
@@ -235,7 +235,7 @@ def _remap_tree_node(node, remap):
 
 def remap_tree_file(filename, remap):
     """Remap track_ids in a tree JSON file. Returns True if file existed."""
-    path = os.path.join(_OUTPUT_DIR, filename)
+    path = os.path.join(OUTPUT_DIR, filename)
     if not os.path.exists(path):
         return False
 
@@ -274,7 +274,7 @@ def remap_tree_file(filename, remap):
 
 def remap_workshop_state(remap):
     """Remap track IDs in set_workshop_state.json."""
-    path = os.path.join(_OUTPUT_DIR, "set_workshop_state.json")
+    path = os.path.join(OUTPUT_DIR, "set_workshop_state.json")
     if not os.path.exists(path):
         return False
 
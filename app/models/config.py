@@ -32,6 +32,7 @@ class AppConfig(BaseModel):
     audio_path_from: str = "/Volumes/Macintosh HD/Users/jasonfurnell/Dropbox"
     audio_path_to: str = "/Users/jason.furnell/Dropbox (Personal)"
     dropbox_path_prefix: str = ""
+    autosave_gzip: bool = False
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +51,7 @@ class ConfigUpdate(BaseModel):
     audio_path_from: str | None = None
     audio_path_to: str | None = None
     dropbox_path_prefix: str | None = None
+    autosave_gzip: bool | None = None
 
 
 class PhaseProfileCreate(BaseModel):
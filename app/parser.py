@@ -2,6 +2,7 @@
 
 import re
 from collections import Counter
+from itertools import compress
 
 import pandas as pd
 
@@ -119,9 +120,27 @@ def parse_all_comments(df):
     return df
 
 
+_FACET_COLUMNS = ("_genre1", "_genre2", "_descriptors", "_mood", "_location", "_era")
+
+
+def reparse_comments(df, ids):
+    """Refresh the parsed facet columns for rows ``ids`` after their comment
+    changed. No-op if ``df`` was never parsed. Mutates df in place."""
+    if "_genre1" not in df.columns or not len(ids):
+        return df
+    rows = []
+    for c in df.loc[ids, "comment"].tolist():
+        p = parse_comment(c) if pd.notna(c) else parse_comment("")
+        rows.append((normalize_genre(p["genre1"]), normalize_genre(p["genre2"]),
+                     p["descriptors"], p["mood"], p["location"], p["era"]))
+    for col, values in zip(_FACET_COLUMNS, zip(*rows)):
+        df.loc[ids, col] = list(values)
+    return df
+
+
 def invalidate_parsed_columns(df):
     """Remove parsed facet columns so they'll be recomputed on next access."""
-    for col in ("_genre1", "_genre2", "_descriptors", "_mood", "_location", "_era"):
+    for col in _FACET_COLUMNS:
         if col in df.columns:
             df.drop(columns=[col], inplace=True)
 
@@ -357,11 +376,13 @@ def faceted_search(df, filters):
     # Genre filter (matches in either _genre1 or _genre2)
     genres = filters.get("genres")
     if genres:
-        genres_lower = [g.lower() for g in genres]
-        mask &= (
-            df["_genre1"].str.lower().isin(genres_lower) |
-            df["_genre2"].str.lower().isin(genres_lower)
-        )
+        # Resolve the filter against the few distinct genre labels, then do a
+        # plain hash isin over the columns, instead of lowercasing every row
+        genres_lower = {g.lower() for g in genres}
+        labels = set(df["_genre1"].unique()) | set(df["_genre2"].unique())
+        hits = [g for g in labels
+                if isinstance(g, str) and g.lower() in genres_lower]
+        mask &= df["_genre1"].isin(hits) | df["_genre2"].isin(hits)
 
     # Mood keywords (OR — any keyword matches)
     mood_kw = filters.get("mood")
@@ -480,103 +501,86 @@ def scored_search(df, filters, min_score=0.0, max_results=200):
     if max_possible == 0:
         return []
 
-    results = []
+    # Score column-wise: each facet keyword is matched against a whole
+    # lowered column in one pass, then only the surviving top rows get their
+    # matched-facets dict built. Row-for-row identical to scoring each row.
+    n = len(df)
+    scores = [0.0] * n
+    hits = []  # (facet, label, per-row match flags), in facet order
 
-    for idx, row in df.iterrows():
-        score = 0.0
-        matched = {}
+    def add(facet, label, flags, points):
+        for i in compress(range(n), flags):
+            scores[i] += points
+        hits.append((facet, label, flags))
 
-        # Genre scoring (3pts per match)
-        if genres:
-            g1 = str(row["_genre1"]).lower()
-            g2 = str(row["_genre2"]).lower()
-            genre_matches = []
-            for g in genres:
-                gl = g.lower()
-                if gl == g1 or gl == g2:
-                    score += 3.0
-                    genre_matches.append(g)
-            if genre_matches:
-                matched["genres"] = genre_matches
-
-        # Mood keyword scoring (1.5pts per match)
-        if mood_kw:
-            mood_val = str(row["_mood"]).lower()
-            mood_matches = []
-            for kw in mood_kw:
-                if kw.lower() in mood_val:
-                    score += 1.5
-                    mood_matches.append(kw)
-            if mood_matches:
-                matched["mood"] = mood_matches
-
-        # Descriptor keyword scoring (1.5pts per match)
-        if desc_kw:
-            desc_val = str(row["_descriptors"]).lower()
-            desc_matches = []
-            for kw in desc_kw:
-                if kw.lower() in desc_val:
-                    score += 1.5
-                    desc_matches.append(kw)
-            if desc_matches:
-                matched["descriptors"] = desc_matches
-
-        # Location scoring (2pts per match)
-        if locations:
-            loc_val = str(row["_location"]).lower()
-            loc_matches = []
-            for loc in locations:
-                if loc.lower() in loc_val:
-                    score += 2.0
-                    loc_matches.append(loc)
-            if loc_matches:
-                matched["location"] = loc_matches
-
-        # Era scoring (1.5pts per match)
-        if eras:
-            era_val = str(row["_era"]).lower()
-            era_matches = []
-            for era in eras:
-                if era.lower() in era_val:
-                    score += 1.5
-                    era_matches.append(era)
-            if era_matches:
-                matched["era"] = era_matches
-
-        # BPM range scoring (2pts)
-        if bpm_min is not None or bpm_max is not None:
-            try:
-                bpm = float(row.get("bpm", 0) or 0)
-                in_range = bpm > 0
-                if in_range and bpm_min is not None and bpm < float(bpm_min):
-                    in_range = False
-                if in_range and bpm_max is not None and bpm > float(bpm_max):
-                    in_range = False
-                if in_range:
-                    score += 2.0
-                    matched["bpm"] = True
-            except (ValueError, TypeError):
-                pass
-
-        # Year range scoring (1pt)
-        if year_min is not None or year_max is not None:
-            try:
-                year = float(row.get("year", 0) or 0)
-                in_range = year > 0
-                if in_range and year_min is not None and year < float(year_min):
-                    in_range = False
-                if in_range and year_max is not None and year > float(year_max):
-                    in_range = False
-                if in_range:
-                    score += 1.0
-                    matched["year"] = True
-            except (ValueError, TypeError):
-                pass
+    # Genre scoring (3pts per match)
+    if genres:
+        g1 = _lowered(df, "_genre1")
+        g2 = _lowered(df, "_genre2")
+        for g in genres:
+            gl = g.lower()
+            add("genres", g, [gl == a or gl == b for a, b in zip(g1, g2)], 3.0)
+
+    # Keyword scoring: mood/descriptors/era 1.5pts, location 2pts per match
+    for facet, col, keywords, points in (
+            ("mood", "_mood", mood_kw, 1.5),
+            ("descriptors", "_descriptors", desc_kw, 1.5),
+            ("location", "_location", locations, 2.0),
+            ("era", "_era", eras, 1.5)):
+        if keywords:
+            values = _lowered(df, col)
+            for kw in keywords:
+                kl = kw.lower()
+                add(facet, kw, [kl in v for v in values], points)
+
+    # BPM range (2pts) and year range (1pt)
+    for facet, lo, hi, points in (("bpm", bpm_min, bpm_max, 2.0),
+                                  ("year", year_min, year_max, 1.0)):
+        if lo is None and hi is None:
+            continue
+        try:
+            lo = float(lo) if lo is not None else None
+            hi = float(hi) if hi is not None else None
+        except (ValueError, TypeError):
+            continue  # an unparseable bound matches no rows
+        if facet in df.columns:
+            values = [_to_float(v) for v in df[facet].tolist()]
+        else:
+            values = [0.0] * n
+        # NaN compares False, so unparseable values never land in range
+        add(facet, True, [v > 0 and (lo is None or v >= lo)
+                          and (hi is None or v <= hi) for v in values], points)
 
+    results = []
+    for i, score in enumerate(scores):
         if score > 0:
             normalized = round(score / max_possible, 4)
             if normalized >= min_score:
-                results.append((idx, normalized, matched))
+                results.append((i, normalized))
 
     results.sort(key=lambda x: x[1], reverse=True)
-    return results[:max_results]
+    labels = df.index.tolist()
+    out = []
+    for i, normalized in results[:max_results]:
+        matched = {}
+        for facet, label, flags in hits:
+            if flags[i]:
+                if label is True:
+                    matched[facet] = True
+                else:
+                    matched.setdefault(facet, []).append(label)
+        out.append((labels[i], normalized, matched))
+    return out
+
+
+def _lowered(df, col):
+    """``str(value).lower()`` for every value of ``col`` (NaN -> "nan")."""
+    return [str(v).lower() for v in df[col].tolist()]
+
+
+def _to_float(value):
+    """``float(value or 0)``, or NaN when the value isn't numeric."""
+    try:
+        return float(value or 0)
+    except (ValueError, TypeError):
+        return float("nan")
@@ -7,15 +7,15 @@ import re
 import uuid
 from datetime import datetime, timezone
 
+from app.config import OUTPUT_DIR
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Persistence
 # ---------------------------------------------------------------------------
 
-_PROFILES_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "phase_profiles.json"
-)
+_PROFILES_FILE = os.path.join(OUTPUT_DIR, "phase_profiles.json")
 
 _profiles: dict = {}  # id -> profile dict
 
@@ -166,14 +166,14 @@ def validate_phases(phases):
         color = p.get("color", "")
         if not _HEX_RE.match(color):
             return False, f"Phase '{p['name']}' has invalid color (need #RRGGBB)"
-    # Check contiguous coverage 0..100
+    # Check contiguous coverage 0..100: one pass comparing adjacent ends
     if phases[0]["pct"][0] != 0:
         return False, "First phase must start at 0%"
     if phases[-1]["pct"][1] != 100:
         return False, "Last phase must end at 100%"
-    for i in range(len(phases) - 1):
-        if phases[i]["pct"][1] != phases[i + 1]["pct"][0]:
-            return False, f"Gap or overlap between '{phases[i]['name']}' and '{phases[i + 1]['name']}'"
+    for prev, p in zip(phases, phases[1:]):
+        if prev["pct"][1] != p["pct"][0]:
+            return False, f"Gap or overlap between '{prev['name']}' and '{p['name']}'"
     return True, None
 
 
@@ -1,6 +1,5 @@
 """Playlist CRUD, LLM playlist suggestion generation, and export (M3U / CSV)."""
 
-import io
 import json
 import logging
 import os
@@ -12,15 +11,15 @@ from datetime import datetime, timezone
 import pandas as pd
 from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_type
 
+from app.config import OUTPUT_DIR
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Persistence
 # ---------------------------------------------------------------------------
 
-_PLAYLISTS_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "playlists.json"
-)
+_PLAYLISTS_FILE = os.path.join(OUTPUT_DIR, "playlists.json")
 
 _playlists: dict = {}  # id -> playlist dict
 _playlists_loaded = False
@@ -442,49 +441,78 @@ def rerank_tracks(candidate_tracks, playlist_name, description,
 # Export
 # ---------------------------------------------------------------------------
 
-def export_m3u(playlist_id, df):
-    """Generate extended M3U8 content for a playlist (UTF-8, Lexicon compatible).
+# Rows rendered per chunk while streaming an export
+_EXPORT_CHUNK_ROWS = 1000
+
+
+def _str_column(df, ids, col, default):
+    """``str()`` of each value of ``col`` for ``ids`` (``default`` if the
+    column is missing)."""
+    if col not in df.columns:
+        return [default] * len(ids)
+    return [str(v) for v in df.loc[ids, col].tolist()]
 
-    Returns string with #EXTM3U header, #PLAYLIST tag, and #EXTINF entries.
+
+def export_m3u_iter(playlist_id, df):
+    """Stream extended M3U8 content for a playlist (UTF-8, Lexicon compatible).
+
+    Returns None if the playlist doesn't exist, else a generator of UTF-8
+    byte chunks: the #EXTM3U header and #PLAYLIST tag, then #EXTINF entries
+    ``_EXPORT_CHUNK_ROWS`` tracks at a time.
     Lexicon DJ can import this by dragging the .m3u8 file onto its playlists panel.
     """
     _ensure_playlists_loaded()
     p = _playlists.get(playlist_id)
     if not p:
         return None
+    return m3u_iter(df, p["track_ids"], p["name"])
 
-    lines = ["#EXTM3U", f"#PLAYLIST:{p['name']}"]
 
-    for tid in p["track_ids"]:
-        if tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {title}")
-        if location and location != "nan":
-            lines.append(location)
+def m3u_iter(df, track_ids, name):
+    """Generator of UTF-8 M3U8 chunks for ``track_ids`` under playlist
+    ``name`` (ids missing from ``df`` are skipped)."""
+    valid_ids = [tid for tid in track_ids if tid in df.index]
+
+    def generate():
+        yield f"#EXTM3U\n#PLAYLIST:{name}\n".encode("utf-8")
+        for start in range(0, len(valid_ids), _EXPORT_CHUNK_ROWS):
+            ids = valid_ids[start:start + _EXPORT_CHUNK_ROWS]
+            lines = []
+            for artist, title, location in zip(
+                    _str_column(df, ids, "artist", "Unknown"),
+                    _str_column(df, ids, "title", "Unknown"),
+                    _str_column(df, ids, "location", "")):
+                lines.append(f"#EXTINF:-1,{artist} - {title}\n")
+                if location and location != "nan":
+                    lines.append(f"{location}\n")
+            yield "".join(lines).encode("utf-8")
 
-    return "\n".join(lines) + "\n"
+    return generate()
 
 
-def export_csv(playlist_id, df):
-    """Return CSV content for a playlist's tracks. Returns BytesIO."""
+def export_csv_iter(playlist_id, df):
+    """Stream CSV content for a playlist's tracks.
+
+    Returns None if the playlist doesn't exist, else a generator of UTF-8
+    byte chunks: the header with the first rows, then ``_EXPORT_CHUNK_ROWS``
+    rows at a time, so large playlists are never held in memory whole.
+    """
     _ensure_playlists_loaded()
     p = _playlists.get(playlist_id)
     if not p:
         return None
 
     valid_ids = [tid for tid in p["track_ids"] if tid in df.index]
-    subset = df.loc[valid_ids]
     # Drop internal columns
-    export_cols = [c for c in subset.columns if not c.startswith("_")]
+    export_cols = [c for c in df.columns if not c.startswith("_")]
 
-    buf = io.BytesIO()
-    subset[export_cols].to_csv(buf, index=False)
-    buf.seek(0)
-    return buf
+    def generate():
+        # At least one pass so an empty playlist still gets its header row
+        for start in range(0, max(len(valid_ids), 1), _EXPORT_CHUNK_ROWS):
+            chunk = df.loc[valid_ids[start:start + _EXPORT_CHUNK_ROWS], export_cols]
+            yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+    return generate()
 
 
 # ---------------------------------------------------------------------------
@@ -494,6 +522,9 @@ def export_csv(playlist_id, df):
 def import_m3u(file_content, filename, df):
     """Import an M3U/M3U8 playlist file, matching tracks to the DataFrame.
 
+    ``file_content`` is the decoded text or any iterable of its lines (e.g.
+    a decoding stream reader), which is consumed in a single pass.
+
     Match strategy (in priority order):
       1. Exact match on 'location' column (file path)
       2. Filename-only match (basename, case-insensitive)
@@ -501,19 +532,17 @@ def import_m3u(file_content, filename, df):
 
     Returns dict with: playlist, matched_count, unmatched_count, unmatched_tracks
     """
-    lines = file_content.splitlines()
-
-    # Extract playlist name from #PLAYLIST tag or filename
-    playlist_name = os.path.splitext(filename)[0]
-    for line in lines:
-        if line.startswith("#PLAYLIST:"):
-            playlist_name = line[len("#PLAYLIST:"):].strip()
-            break
+    if isinstance(file_content, str):
+        file_content = file_content.splitlines()
 
+    # Playlist name comes from the first #PLAYLIST tag, else the filename.
     # Parse EXTINF entries: collect (artist_title_str, file_path) pairs
+    playlist_name = None
     entries = []
     pending_info = None
-    for line in lines:
+    for line in file_content:
+        if playlist_name is None and line.startswith("#PLAYLIST:"):
+            playlist_name = line[len("#PLAYLIST:"):].strip()
         line = line.strip()
         if not line or line == "#EXTM3U":
             continue
@@ -535,6 +564,8 @@ def import_m3u(file_content, filename, df):
 
     if not entries:
         return {"error": "No tracks found in the playlist file"}
+    if playlist_name is None:
+        playlist_name = os.path.splitext(filename)[0]
 
     # Build lookup indexes from the DataFrame
     loc_index = {}       # full path -> track id
@@ -1,27 +1,50 @@
+import atexit
+import codecs
+import functools
 import hashlib
 import io
 import json
 import logging
+import operator
 import os
+import queue
+import shutil
+import stat
+import string
 import subprocess
 import threading
 import time
+import unicodedata
 import urllib.parse
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 import pandas as pd
+import urllib3
 import dropbox
 from dropbox import DropboxOAuth2Flow
 from flask import Blueprint, request, jsonify, Response, send_file, redirect
+from werkzeug.http import dump_options_header
 from anthropic import Anthropic
 from openai import OpenAI
 from dotenv import load_dotenv
 
+try:
+    import orjson                  # optional: faster (de)serialisation
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl                   # POSIX only; used for F_FULLFSYNC on macOS
+except ImportError:
+    fcntl = None
+
 from app.tagger import generate_genre_comment
-from app.config import load_config, save_config, DEFAULT_CONFIG
+from app.config import (
+    load_config, save_config, DEFAULT_CONFIG, OUTPUT_DIR, PROJECT_ROOT,
+)
 from app.parser import (
-    parse_all_comments, invalidate_parsed_columns,
+    parse_all_comments, reparse_comments,
     build_genre_cooccurrence, build_genre_landscape_summary,
     build_facet_options, faceted_search, scored_search,
     build_chord_data,
@@ -31,7 +54,7 @@ from app.playlist import (
     delete_playlist, add_tracks_to_playlist, remove_tracks_from_playlist,
     generate_playlist_suggestions, generate_vibe_suggestions,
     generate_seed_suggestions, generate_intersection_suggestions,
-    rerank_tracks, export_m3u, export_csv, import_m3u,
+    rerank_tracks, export_m3u_iter, export_csv_iter, import_m3u, m3u_iter,
 )
 from app.dedup import (
     find_duplicate_groups, pick_winners, execute_cleanup,
@@ -56,7 +79,7 @@ from app.phases import (
 )
 from app.setbuilder import (
     get_browse_sources, get_source_detail, get_source_info,
-    get_source_tracks, select_tracks_for_source,
+    get_source_tracks, select_tracks_for_source, no_audio_check,
     build_track_context, find_leaf_for_track, find_all_leaves_for_track,
     save_set_state, load_set_state,
     create_saved_set, get_saved_set, list_saved_sets,
@@ -67,16 +90,140 @@ from app.chat import run_chat_turn, simplify_history_for_frontend
 
 api = Blueprint("api", __name__)
 
+
+class _ShardedLRU:
+    """Size-bounded, thread-safe LRU mapping split into independently
+    locked shards, so concurrent artwork workers rarely contend.
+
+    Supports the dict operations the artwork code uses (``in``, ``get``,
+    item get/set, ``items``/``values``, ``len``); least-recently-used
+    entries are evicted once a shard exceeds its share of ``capacity``.
+    """
+
+    def __init__(self, data=None, capacity=100_000, shards=16):
+        self._cap = max(1, capacity // shards)
+        self._shards = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        if data:
+            for key, value in data.items():
+                self[key] = value
+
+    def _slot(self, key):
+        i = hash(key) % len(self._shards)
+        return self._shards[i], self._locks[i]
+
+    def get(self, key, default=None):
+        shard, lock = self._slot(key)
+        with lock:
+            if key not in shard:
+                return default
+            shard.move_to_end(key)
+            return shard[key]
+
+    def __getitem__(self, key):
+        shard, lock = self._slot(key)
+        with lock:
+            shard.move_to_end(key)     # raises KeyError if missing
+            return shard[key]
+
+    def __setitem__(self, key, value):
+        shard, lock = self._slot(key)
+        with lock:
+            shard[key] = value
+            shard.move_to_end(key)
+            while len(shard) > self._cap:
+                shard.popitem(last=False)
+
+    def __contains__(self, key):
+        shard, lock = self._slot(key)
+        with lock:
+            return key in shard
+
+    def __len__(self):
+        return sum(len(s) for s in self._shards)
+
+    def items(self):
+        """Iterate a snapshot of all entries, one shard at a time: each shard
+        is copied under its own lock and yielded after the lock is released,
+        so a full scan never blocks lookups for more than one shard copy."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                chunk = list(shard.items())
+            yield from chunk
+
+    def values(self):
+        return (v for _, v in self.items())
+
+    def keys(self):
+        """Snapshot of all keys as a set (cheap bulk membership tests)."""
+        out = set()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                out.update(shard)
+        return out
+
+
+class _TTLCache:
+    """Small thread-safe LRU mapping whose entries also expire ``ttl``
+    seconds after they were stored (``get``, ``in``, item set, ``pop``)."""
+
+    def __init__(self, maxsize, ttl):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data = OrderedDict()     # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return default
+            if hit[1] <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return hit[0]
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self._ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            hit = self._data.pop(key, None)
+        return default if hit is None else hit[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_MISSING = object()
+
+_DROPBOX_EXISTS_MAX = 100_000
+_DROPBOX_EXISTS_TTL = 3600     # re-check Dropbox membership hourly
+
+
 # ---------------------------------------------------------------------------
 # Session state (in-memory, single-user)
 # ---------------------------------------------------------------------------
 _state = {
     "df": None,
     "original_filename": None,
+    "_autosave_path": None,      # output/<original>_autosave.csv, set per upload
     "tagging_thread": None,
     "stop_flag": threading.Event(),
     "progress_listeners": [],   # list of queue.Queue for SSE
-    "_analysis_cache": None,     # cached analysis data for workshop
+    "_analysis_cache": None,     # (df epoch, analysis data) for workshop
     # Collection Tree (Genre)
     "tree": None,
     "tree_thread": None,
@@ -93,40 +240,190 @@ _state = {
     "collection_tree_stop_flag": threading.Event(),
     "collection_tree_progress_listeners": [],
     "_preview_cache": {},          # "artist||title" -> {preview_url, found, ...}
-    "_artwork_cache": {},          # "artist||title" -> {cover_url, found}
-    "_chord_cache": None,          # cached chord diagram data
+    "_artwork_cache": _ShardedLRU(),  # "artist||title" -> {cover_url, found}
+    "_chord_cache": OrderedDict(),  # (df epoch, params key) -> chord data
     # Dropbox integration
     "_dropbox_client": None,       # dropbox.Dropbox instance
     "_dropbox_refresh_token": None,
     "_dropbox_account_id": None,
-    "_dropbox_exists_cache": {},   # dropbox_path -> bool
+    "_dropbox_tokens_saved": None,  # last token dict written to disk
+    "_dropbox_exists_cache": _TTLCache(_DROPBOX_EXISTS_MAX,
+                                       _DROPBOX_EXISTS_TTL),  # path -> bool
     "_dropbox_oauth_csrf": None,   # CSRF token for OAuth flow
     # Auto Set (narrative set builder)
     "autoset_result": None,
-    "autoset_thread": None,
+    "autoset_job": None,           # Future on the background pool
     "autoset_stop_flag": threading.Event(),
     "autoset_progress_listeners": [],
     # Chat (conversational AI)
     "chat_history": [],
-    "chat_thread": None,
+    "chat_rev": 0,                 # bumped on every history append and clear
+    "chat_job": None,              # Future on the background pool
     "chat_stop_flag": threading.Event(),
     "chat_progress_listeners": [],
 }
 
+# ---------------------------------------------------------------------------
+# DataFrame publication (copy-on-write)
+#
+# _state["df"] is treated as an immutable snapshot once published.  Readers
+# grab the reference once (``df = _state["df"]``) and never lock — attribute
+# and dict assignment are atomic under the GIL, so a reader always sees a
+# complete frame.  Writers never mutate the published frame in place: they
+# copy it, edit the copy and publish the result via _update_df().  Whole-frame
+# replacements (upload, restore, dedup) go through _publish_df(), which bumps
+# the epoch so in-flight row edits based on the old frame are dropped.
+# Every publication bumps _df_version, so "has anything changed?" is a single
+# integer comparison (see _autosave).
+# ---------------------------------------------------------------------------
+_df_write_lock = threading.Lock()
+_df_epoch = 0
+_df_version = 0
+
+
+def _publish_df(df):
+    """Replace the published DataFrame wholesale (new upload/restore/dedup)."""
+    global _df_epoch, _df_version
+    with _df_write_lock:
+        _df_epoch += 1
+        _df_version += 1
+        _state["df"] = df
+
+
+def _update_df(mutate, epoch=None, needed=None):
+    """Copy the published DataFrame, apply ``mutate(copy)`` and publish it.
+
+    If ``epoch`` is given and a different frame has been published since,
+    the edit is dropped and None is returned. If ``needed(df)`` is given it
+    is re-checked under the write lock; when it is false the current frame
+    is returned unchanged (double-checked updates such as lazy parsing).
+    """
+    global _df_version
+    with _df_write_lock:
+        df = _state["df"]
+        if df is None or (epoch is not None and epoch != _df_epoch):
+            return None
+        if needed is not None and not needed(df):
+            return df
+        # pandas >= 3 is always copy-on-write: a shallow copy shares every
+        # column buffer with the published frame and only the blocks that
+        # mutate() touches get copied, so publishing is O(#blocks), not O(N).
+        new_df = df.copy(deep=False)
+        mutate(new_df)
+        _df_version += 1
+        _state["df"] = new_df
+        return new_df
+
+
+def _replace_df_if(expected, new_df):
+    """Publish ``new_df`` only if ``expected`` is still the published frame
+    (compare-and-swap for work done outside the write lock). Returns True
+    if it was published."""
+    global _df_version
+    with _df_write_lock:
+        if _state["df"] is not expected:
+            return False
+        _df_version += 1
+        _state["df"] = new_df
+        return True
+
+
+def _set_track_fields(track_id, epoch=None, **fields):
+    """Copy-on-write update of one row's columns. Returns the new frame.
+
+    Returns None if ``epoch`` no longer matches. If the frame has no
+    ``track_id`` row, nothing is published and the current frame is returned
+    (``df.at`` would otherwise append a phantom all-NaN row).
+    A new comment also refreshes the row's parsed facet columns, so parsed
+    frames never carry facets from an older comment.
+    """
+    def mutate(df):
+        if track_id not in df.index:
+            return
+        for col, val in fields.items():
+            df.at[track_id, col] = val
+        if "comment" in fields:
+            reparse_comments(df, [track_id])
+    return _update_df(mutate, epoch=epoch,
+                      needed=lambda df: track_id in df.index)
+
 # ---------------------------------------------------------------------------
 # Persistent artwork cache (survives server restarts)
 # ---------------------------------------------------------------------------
-_ARTWORK_CACHE_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "artwork_cache.json"
-)
+_ARTWORK_CACHE_FILE = os.path.join(OUTPUT_DIR, "artwork_cache.json")
 _artwork_cache_lock = threading.Lock()
 
+
+_ORJSON_OPTS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                if orjson is not None else 0)
+
+
+def _json_loads(data):
+    """Decode JSON from bytes or str, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj):
+    """Encode ``obj`` as UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_response(obj):
+    """``jsonify`` for large payloads: encoded by orjson when installed,
+    falling back to Flask's encoder for types orjson doesn't handle."""
+    if orjson is not None:
+        try:
+            return Response(orjson.dumps(obj, option=_ORJSON_OPTS),
+                            mimetype="application/json")
+        except TypeError:
+            pass
+    return jsonify(obj)
+
+
+def _fsync_fd(fd):
+    """Flush ``fd`` to stable storage (F_FULLFSYNC on macOS, where fsync
+    only reaches the drive cache)."""
+    if fcntl is not None and hasattr(fcntl, "F_FULLFSYNC"):
+        try:
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+            return
+        except OSError:
+            pass
+    os.fsync(fd)
+
+
+def _write_durable(path, data):
+    """Atomically replace ``path`` with ``data`` so a crash leaves either
+    the old or the new contents, never a truncated file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        _fsync_fd(f.fileno())
+    os.replace(tmp, path)
+    # Persist the rename itself; directories can't be opened on Windows.
+    try:
+        dfd = os.open(os.path.dirname(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
+
+
 def _load_artwork_cache():
     """Load artwork cache from disk into _state."""
     try:
         if os.path.exists(_ARTWORK_CACHE_FILE):
-            with open(_ARTWORK_CACHE_FILE, "r") as f:
-                _state["_artwork_cache"] = json.load(f)
+            with open(_ARTWORK_CACHE_FILE, "rb") as f:
+                _state["_artwork_cache"] = _ShardedLRU(_json_loads(f.read()))
             logging.info("Loaded %d artwork cache entries from disk",
                          len(_state["_artwork_cache"]))
     except Exception:
@@ -136,32 +433,181 @@ def _save_artwork_cache():
     """Persist artwork cache to disk (thread-safe)."""
     with _artwork_cache_lock:
         try:
-            snapshot = dict(_state["_artwork_cache"])   # safe copy
-            # Write to temp file then rename for atomicity
-            tmp = _ARTWORK_CACHE_FILE + ".tmp"
-            with open(tmp, "w") as f:
-                json.dump(snapshot, f)
-            os.replace(tmp, _ARTWORK_CACHE_FILE)
+            snapshot = dict(_state["_artwork_cache"].items())
+            _write_durable(_ARTWORK_CACHE_FILE, _json_dumps(snapshot))
         except Exception:
             logging.exception("Failed to save artwork cache to disk")
 
+# Writes are debounced: callers mark the cache dirty and a single saver
+# thread persists it once per window, so a burst of lookups costs one
+# O(N) dump instead of one per batch.
+_ARTWORK_SAVE_DELAY = 3.0
+_artwork_save_pending = threading.Event()
+
+
+def _artwork_cache_saver():
+    while True:
+        _artwork_save_pending.wait()
+        time.sleep(_ARTWORK_SAVE_DELAY)     # coalesce everything in the window
+        _artwork_save_pending.clear()
+        _save_artwork_cache()
+
+
+def _schedule_artwork_cache_save():
+    """Mark the artwork cache dirty; the saver thread writes it shortly."""
+    _artwork_save_pending.set()
+
+
+@atexit.register
+def _flush_artwork_cache():
+    if _artwork_save_pending.is_set():
+        _save_artwork_cache()
+
 # NOTE: _load_artwork_cache() is called lazily via _ensure_initialized()
 # to prevent module-level I/O from blocking gunicorn worker startup.
 
 # ---------------------------------------------------------------------------
 # Local artwork files (downloaded from Deezer CDN for reliable serving)
 # ---------------------------------------------------------------------------
-_ARTWORK_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "artwork"
-)
+_ARTWORK_DIR = os.path.join(OUTPUT_DIR, "artwork")
 # NOTE: os.makedirs moved into _ensure_initialized() to avoid import-time I/O
 # that can block gunicorn worker boot if the filesystem is slow.
 
 
+# ---------------------------------------------------------------------------
+# Outbound HTTP (Deezer / iTunes search APIs and their image CDNs)
+# ---------------------------------------------------------------------------
+_HTTP_HEADERS = {"User-Agent": "GenreTagger/1.0"}
+
+# One long-lived pool for all artwork fan-out (batch route + bulk workers)
+# instead of spinning up fresh threads for every chunk.
+_ARTWORK_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="artwork")
+
+
+# Keep-alive connection pool shared by every outbound request, so the bulk
+# workers pay one TLS handshake per host rather than one per lookup.
+_HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=16,
+    headers=_HTTP_HEADERS,
+    retries=urllib3.Retry(total=2, backoff_factor=0.2,
+                          status_forcelist=(502, 503, 504)),
+)
+
+
+class _TokenBucket:
+    """Blocking token bucket: sustains ``rate`` calls/sec and allows bursts
+    of up to ``burst``. Callers reserve a token and sleep off any debt
+    outside the lock, so concurrent threads queue fairly."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Per-host API quotas. Deezer allows 50 requests per 5 s and answers excess
+# calls with an error body the artwork lookup would cache as "no artwork",
+# so its bucket stays under the quota even from full: 8 burst + 5 s x 8/s
+# = 48 calls in any 5 s window. Image CDNs are not limited.
+_RATE_LIMITS = {
+    "api.deezer.com": _TokenBucket(rate=8, burst=8),
+    "itunes.apple.com": _TokenBucket(rate=8, burst=16),
+}
+
+
+def _http_request(url, timeout=8, headers=None, stream=False):
+    """GET ``url`` through the shared pool. Raises on 4xx/5xx; a 304 reply
+    to a conditional request is returned to the caller.
+
+    With ``stream=True`` the body is left unread: the caller reads it as a
+    file object and must call ``release_conn()`` when done.
+    """
+    limiter = _RATE_LIMITS.get(urllib.parse.urlsplit(url).hostname)
+    if limiter is not None:
+        limiter.acquire()
+    resp = _HTTP.request(
+        "GET", url, headers={**_HTTP_HEADERS, **(headers or {})},
+        timeout=urllib3.Timeout(connect=3, read=timeout),
+        preload_content=not stream,
+    )
+    if resp.status >= 400:
+        if stream:
+            resp.drain_conn()
+            resp.release_conn()
+        raise urllib3.exceptions.HTTPError(f"HTTP {resp.status} for {url}")
+    return resp
+
+
+def _http_get(url, timeout=8):
+    """GET ``url`` and return the response body as bytes."""
+    return _http_request(url, timeout).data
+
+
+def _http_get_json(url, timeout=5):
+    """GET ``url`` and decode the JSON body."""
+    return _json_loads(_http_get(url, timeout))
+
+
+@functools.lru_cache(maxsize=65536)
+def _norm(s):
+    """Case/whitespace-normalise an artist or title (memoised; the bulk
+    workers see the same artist names thousands of times)."""
+    return s.strip().lower()
+
+
+@functools.lru_cache(maxsize=65536)
+def _quote_query(artist, title):
+    """URL-encoded ``artist title`` search term for Deezer/iTunes."""
+    return urllib.parse.quote(f"{artist} {title}")
+
+
+@functools.lru_cache(maxsize=65536)
+def _match(a_low, d_artist, t_low, d_title):
+    """True if a search hit's (normalised) artist and title each contain,
+    or are contained in, the ones we searched for."""
+    return ((a_low in d_artist or d_artist in a_low)
+            and (t_low in d_title or d_title in t_low))
+
+
+def _artwork_key(artist, title):
+    """Cache key shared by the artwork and preview caches."""
+    return f"{_norm(artist)}||{_norm(title)}"
+
+
+@functools.lru_cache(maxsize=131072)
+def _artwork_hash(cache_key):
+    return hashlib.md5(cache_key.encode()).hexdigest()
+
+
 def _artwork_filename(cache_key, size="small"):
     """Deterministic filename for a cached artwork image."""
-    h = hashlib.md5(cache_key.encode()).hexdigest()
-    return f"{h}_{size}.jpg"
+    return f"{_artwork_hash(cache_key)}_{size}.jpg"
+
+
+# Deletes every allowed character, so translate() leaves only the bad ones
+_ARTWORK_NAME_STRIP = str.maketrans(
+    "", "", string.ascii_letters + string.digits + "._-")
+
+
+def _valid_artwork_filename(filename):
+    """True for a bare artwork filename (alnum plus ``._-``, no dot-files)."""
+    return (bool(filename) and filename[0] != "."
+            and ".." not in filename
+            and not filename.translate(_ARTWORK_NAME_STRIP))
 
 
 def _download_artwork_local(url, cache_key, size="small"):
@@ -172,25 +618,36 @@ def _download_artwork_local(url, cache_key, size="small"):
     local_path = os.path.join(_ARTWORK_DIR, fname)
     if os.path.exists(local_path):
         return f"/artwork/{fname}"
+    # Stream to a per-thread temp file and rename into place, so a crash or
+    # dropped connection never leaves a truncated JPEG behind.
+    tmp = f"{local_path}.{threading.get_ident()}.tmp"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "GenreTagger/1.0"})
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            data = resp.read()
-        with open(local_path, "wb") as f:
-            f.write(data)
+        resp = _http_request(url, timeout=8, stream=True)
+        try:
+            with open(tmp, "wb") as f:
+                shutil.copyfileobj(resp, f, 65536)
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            resp.release_conn()
+        os.replace(tmp, local_path)
+        _artwork_mtimes.pop(fname, None)
         return f"/artwork/{fname}"
     except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
         return ""
 
 
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"))
+load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
 
 # ---------------------------------------------------------------------------
 # Persistent Dropbox tokens (survives server restarts)
 # ---------------------------------------------------------------------------
-_DROPBOX_TOKENS_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "dropbox_tokens.json"
-)
+_DROPBOX_TOKENS_FILE = os.path.join(OUTPUT_DIR, "dropbox_tokens.json")
+_DROPBOX_POOL_SIZE = 16     # HTTP connections; also the metadata fan-out width
 
 def _init_dropbox_client(refresh_token):
     """Create a Dropbox client from a refresh token."""
@@ -204,6 +661,9 @@ def _init_dropbox_client(refresh_token):
             oauth2_refresh_token=refresh_token,
             app_key=app_key,
             app_secret=app_secret,
+            # One keep-alive pool sized for the metadata fan-out, so
+            # concurrent checks reuse connections instead of re-handshaking
+            session=dropbox.create_session(max_connections=_DROPBOX_POOL_SIZE),
             timeout=30,  # 30s global timeout — generous enough for audio
                          # link generation but prevents infinite hangs.
                          # Per-call 5s timeout in _dropbox_file_exists()
@@ -215,10 +675,13 @@ def _init_dropbox_client(refresh_token):
 
 def _load_dropbox_tokens():
     """Load persisted Dropbox tokens and initialize client."""
+    if _state.get("_dropbox_refresh_token"):
+        return  # already connected in this process
     try:
         if os.path.exists(_DROPBOX_TOKENS_FILE):
-            with open(_DROPBOX_TOKENS_FILE, "r") as f:
-                data = json.load(f)
+            with open(_DROPBOX_TOKENS_FILE, "rb") as f:
+                data = _json_loads(f.read())
+            _state["_dropbox_tokens_saved"] = data
             refresh_token = data.get("refresh_token")
             if refresh_token:
                 _state["_dropbox_refresh_token"] = refresh_token
@@ -229,21 +692,51 @@ def _load_dropbox_tokens():
         logging.exception("Failed to load Dropbox tokens from disk")
 
 def _save_dropbox_tokens():
-    """Persist Dropbox tokens to disk."""
+    """Persist Dropbox tokens to disk (atomically; skipped if unchanged)."""
+    data = {
+        "refresh_token": _state.get("_dropbox_refresh_token"),
+        "account_id": _state.get("_dropbox_account_id", ""),
+    }
+    if data == _state.get("_dropbox_tokens_saved"):
+        return
     try:
         os.makedirs(os.path.dirname(_DROPBOX_TOKENS_FILE), exist_ok=True)
-        data = {
-            "refresh_token": _state.get("_dropbox_refresh_token"),
-            "account_id": _state.get("_dropbox_account_id", ""),
-        }
-        with open(_DROPBOX_TOKENS_FILE, "w") as f:
-            json.dump(data, f)
+        _write_durable(_DROPBOX_TOKENS_FILE, _json_dumps(data))
+        _state["_dropbox_tokens_saved"] = data
     except Exception:
         logging.exception("Failed to save Dropbox tokens to disk")
 
 # NOTE: _load_dropbox_tokens() is called lazily via _ensure_initialized()
 # to prevent module-level network calls from blocking gunicorn worker startup.
 
+# ---------------------------------------------------------------------------
+# Background job pool (Auto Set builds, chat turns)
+# ---------------------------------------------------------------------------
+# A couple of persistent daemon workers fed from a queue, rather than a
+# fresh thread per request. Daemon threads (unlike ThreadPoolExecutor's)
+# never hold up worker shutdown while an LLM call is in flight.
+_BG_WORKERS = 2
+_bg_jobs = queue.Queue()
+
+
+def _bg_runner():
+    while True:
+        fut, fn = _bg_jobs.get()
+        if not fut.set_running_or_notify_cancel():
+            continue
+        try:
+            fut.set_result(fn())
+        except BaseException as e:
+            fut.set_exception(e)
+
+
+def _submit_bg(fn):
+    """Queue ``fn`` on the background pool; returns its Future."""
+    fut = Future()
+    _bg_jobs.put((fut, fn))
+    return fut
+
+
 # ---------------------------------------------------------------------------
 # Lazy initialization — runs once on first request, not at import time.
 # This prevents hung Dropbox/network calls from freezing the worker at boot.
@@ -271,9 +764,17 @@ def _ensure_initialized():
         # Ensure artwork directory exists (moved from module level)
         try:
             os.makedirs(_ARTWORK_DIR, exist_ok=True)
+            # Drop partial downloads left behind by a previous crash
+            for entry in os.scandir(_ARTWORK_DIR):
+                if entry.name.endswith(".tmp"):
+                    os.remove(entry.path)
         except Exception:
-            logging.exception("Failed to create artwork directory")
+            logging.exception("Failed to prepare artwork directory")
         _load_artwork_cache()
+        threading.Thread(target=_artwork_cache_saver, daemon=True).start()
+        threading.Thread(target=_autosave_writer, daemon=True).start()
+        for _ in range(_BG_WORKERS):
+            threading.Thread(target=_bg_runner, daemon=True).start()
         # Wrap Dropbox init in a timeout — a slow token refresh
         # must not hang the first request indefinitely
         try:
@@ -318,9 +819,10 @@ def _dropbox_file_exists(dropbox_path):
     """
     if not dropbox_path:
         return False
-    cache = _state.get("_dropbox_exists_cache", {})
-    if dropbox_path in cache:
-        return cache[dropbox_path]
+    cache = _state["_dropbox_exists_cache"]
+    cached = cache.get(dropbox_path)
+    if cached is not None:
+        return cached
     dbx = _state.get("_dropbox_client")
     if not dbx:
         return False
@@ -330,44 +832,186 @@ def _dropbox_file_exists(dropbox_path):
             future = pool.submit(dbx.files_get_metadata, dropbox_path)
             future.result(timeout=5)
         cache[dropbox_path] = True
+        return True
     except dropbox.exceptions.ApiError:
         cache[dropbox_path] = False
+        return False
     except (FuturesTimeout, Exception):
         # Timeout or network error — don't cache, might work later
         return False
-    _state["_dropbox_exists_cache"] = cache
-    return cache.get(dropbox_path, False)
 
-def _check_has_audio(location):
-    """Check if a track has playable audio (Dropbox first, then local fallback)."""
+# CSV location -> (dropbox_path, mapped local path). Both depend only on the
+# location and the path-mapping config, so they are computed once per
+# location and dropped whenever the config is saved.
+_audio_path_cache = {}
+
+
+# Dropbox temporary links are valid for 4h; reuse one for 3h50m so repeat
+# plays and seeks skip the API round-trip.
+_DROPBOX_LINK_TTL = 3 * 3600 + 50 * 60
+_DROPBOX_LINK_CACHE_MAX = 10_000
+_dropbox_links = OrderedDict()     # dropbox_path -> (link, expires_at)
+_dropbox_links_lock = threading.Lock()
+# dropbox_path -> True for paths whose link request just failed; serve_audio
+# goes straight to the local fallback instead of repeating the API call
+_dropbox_link_failures = _TTLCache(10_000, 60)
+
+
+def _dropbox_temp_link(dbx, dropbox_path):
+    """Temporary streaming link for ``dropbox_path`` (cached until shortly
+    before Dropbox expires it)."""
+    now = time.monotonic()
+    with _dropbox_links_lock:
+        hit = _dropbox_links.get(dropbox_path)
+        if hit is not None and hit[1] > now + 60:
+            _dropbox_links.move_to_end(dropbox_path)
+            return hit[0]
+    link = dbx.files_get_temporary_link(dropbox_path).link
+    with _dropbox_links_lock:
+        _dropbox_links[dropbox_path] = (link, now + _DROPBOX_LINK_TTL)
+        _dropbox_links.move_to_end(dropbox_path)
+        while len(_dropbox_links) > _DROPBOX_LINK_CACHE_MAX:
+            _dropbox_links.popitem(last=False)
+    return link
+
+
+def _audio_paths(location):
+    hit = _audio_path_cache.get(location)
+    if hit is None:
+        hit = (_to_dropbox_path(location), _map_audio_path(location))
+        _audio_path_cache[location] = hit
+    return hit
+
+
+def _check_has_audio(location, prefetched=None):
+    """Check if a track has playable audio (Dropbox first, then local fallback).
+
+    ``prefetched`` is the result of ``_prefetch_dropbox_exists``; paths it
+    already tried (including timeouts) are not asked again.
+    """
     if not location or location == "nan":
         return False
+    dropbox_path, mapped = _audio_paths(str(location))
     dbx = _state.get("_dropbox_client")
-    if dbx:
-        dropbox_path = _to_dropbox_path(str(location))
-        if dropbox_path and _dropbox_file_exists(dropbox_path):
+    if dbx and dropbox_path:
+        if prefetched and dropbox_path in prefetched:
+            exists = prefetched[dropbox_path]
+        else:
+            exists = _dropbox_file_exists(dropbox_path)
+        if exists:
             return True
-    mapped = _map_audio_path(str(location))
-    return bool(mapped and mapped != "nan" and os.path.isfile(mapped))
+    return bool(mapped and mapped != "nan" and _local_file_exists(mapped))
 
-_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
 
+# Local audio fallback: directory -> frozenset of regular-file names, listed
+# once and reused briefly, so the tracks of one album folder cost a single
+# scandir instead of a stat each.
+_local_dir_listings = _TTLCache(10_000, 60)
 
-_LAST_UPLOAD_META = os.path.join(_OUTPUT_DIR, ".last_upload.json")
+
+def _local_file_exists(path):
+    """``os.path.isfile`` answered from cached directory listings.
+
+    Only hits are trusted: on a miss the file is stat'ed, since macOS
+    filesystems match names regardless of case and Unicode normalisation,
+    and a file added since the listing must show up at once.
+    """
+    directory, name = os.path.split(path)
+    names = _local_dir_listings.get(directory)
+    if names is None:
+        try:
+            with os.scandir(directory or ".") as entries:
+                names = frozenset(e.name for e in entries if e.is_file())
+        except OSError:
+            names = frozenset()
+        _local_dir_listings[directory] = names
+    return name in names or os.path.isfile(path)
+
+
+def _prefetch_dropbox_exists(locations):
+    """Warm the Dropbox existence cache for a batch of CSV locations.
+
+    Dropbox has no batch metadata endpoint, so the uncached paths are
+    checked concurrently. Returns {dropbox_path: exists} for the paths it
+    checked, for ``_check_has_audio(..., prefetched=)``: timeouts and network
+    errors are not cached, and must not be retried one by one afterwards.
+    """
+    if not _state.get("_dropbox_client"):
+        return {}
+    cache = _state["_dropbox_exists_cache"]
+    paths = set()
+    for loc in locations:
+        if loc and loc != "nan":
+            dropbox_path = _audio_paths(str(loc))[0]
+            if dropbox_path and dropbox_path not in cache:
+                paths.add(dropbox_path)
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {p: _dropbox_file_exists(p) for p in paths}
+    with ThreadPoolExecutor(
+            max_workers=min(_DROPBOX_POOL_SIZE, len(paths))) as pool:
+        return dict(zip(paths, pool.map(_dropbox_file_exists, paths)))
+
+_LAST_UPLOAD_META = os.path.join(OUTPUT_DIR, ".last_upload.json")
+_autosaved_version = None   # _df_version last written by _autosave()
+
+
+def _autosave_path(original, compressed=False):
+    """Autosave location for an uploaded file (``.csv.gz`` when compressed)."""
+    name = original.rsplit(".", 1)[0] + "_autosave.csv"
+    return os.path.join(OUTPUT_DIR, name + ".gz" if compressed else name)
 
 
 def _autosave():
-    """Write the current DataFrame to output/<original>_autosave.csv."""
-    try:
-        df = _state["df"]
-        if df is None:
-            return
-        os.makedirs(_OUTPUT_DIR, exist_ok=True)
-        original = _state.get("original_filename", "playlist.csv")
-        name = original.rsplit(".", 1)[0] + "_autosave.csv"
-        df.to_csv(os.path.join(_OUTPUT_DIR, name), index=False)
-    except Exception:
-        pass  # never let a save failure interrupt tagging
+    """Write the current DataFrame to output/<original>_autosave.csv.
+
+    Skipped when nothing has been published since the last save (e.g. the
+    final save after a tagging run whose last row was already written).
+    """
+    global _autosaved_version
+    with _autosave_lock:
+        try:
+            version = _df_version   # read before the frame: a newer frame is safe
+            df = _state["df"]
+            path = _state["_autosave_path"]
+            if df is None or path is None or version == _autosaved_version:
+                return
+            if load_config().get("autosave_gzip"):
+                # Level 1 runs near memcpy speed yet still shrinks the CSV several-fold
+                df.to_csv(path + ".gz", index=False,
+                          compression={"method": "gzip", "compresslevel": 1})
+            else:
+                df.to_csv(path, index=False)
+            _autosaved_version = version
+        except Exception:
+            # Never let a save failure interrupt tagging — but don't hide it
+            logging.exception("Autosave failed")
+
+
+# Background autosave: hot paths (the tagging loop, per-track LLM results)
+# mark the frame dirty and a single writer thread rewrites the CSV, so the
+# request or tagging thread never waits on disk. Requests made while a
+# write is running coalesce into one follow-up write of the latest frame.
+_autosave_lock = threading.Lock()
+_autosave_pending = threading.Event()
+
+
+def _autosave_writer():
+    while True:
+        _autosave_pending.wait()
+        _autosave_pending.clear()
+        _autosave()
+
+
+def _schedule_autosave():
+    """Mark the DataFrame dirty; the writer thread autosaves it shortly."""
+    _autosave_pending.set()
+
+
+@atexit.register
+def _flush_autosave():
+    if _autosave_pending.is_set():
+        _autosave()
 
 
 def _save_last_upload_meta():
@@ -376,11 +1020,11 @@ def _save_last_upload_meta():
         original = _state.get("original_filename")
         if not original:
             return
-        os.makedirs(_OUTPUT_DIR, exist_ok=True)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
         with open(_LAST_UPLOAD_META, "w") as f:
             json.dump({"original_filename": original}, f)
     except Exception:
-        pass
+        logging.exception("Failed to save last-upload metadata")
 
 
 _caffeinate_proc = None
@@ -408,7 +1052,10 @@ def _provider_for_model(model):
     return "anthropic" if model.startswith("claude") else "openai"
 
 
+@functools.lru_cache(maxsize=4)
 def _get_client(provider):
+    # One client per provider for the process: the SDK clients are
+    # thread-safe and keep their HTTP connection pool alive between calls.
     if provider == "anthropic":
         return Anthropic(
             api_key=os.getenv("ANTHROPIC_API_KEY"),
@@ -420,31 +1067,30 @@ def _get_client(provider):
     )
 
 
-def _track_status(row):
-    comment = row.get("comment", "")
-    if pd.isna(comment) or str(comment).strip() == "":
-        return "untagged"
-    return "tagged"
-
-
 def _tracks_json():
     df = _state["df"]
-    tracks = []
-    for idx, row in df.iterrows():
-        track = {"id": int(idx)}
-        for col in df.columns:
-            val = row[col]
-            track[col] = "" if pd.isna(val) else val
-        track["status"] = _track_status(row)
-        tracks.append(track)
-    return tracks
+    ids = df.index.tolist()
+    rows = _track_records(df, ids)
+    if "comment" in df.columns:
+        comments = df["comment"]
+        tagged = (comments.notna()
+                  & (comments.astype(str).str.strip() != "")).tolist()
+    else:
+        tagged = [False] * len(ids)
+    return [{"id": int(idx), **rows[idx],
+             "status": "tagged" if t else "untagged"}
+            for idx, t in zip(ids, tagged)]
 
 
 def _summary():
     df = _state["df"]
     total = len(df)
-    tagged = sum(1 for _, r in df.iterrows()
-                 if pd.notna(r.get("comment", "")) and str(r.get("comment", "")).strip())
+    if "comment" not in df.columns:
+        return {"total": total, "tagged": 0, "untagged": total,
+                "columns": list(df.columns)}
+    comments = df["comment"]
+    tagged = int((comments.notna()
+                  & (comments.astype(str).str.strip() != "")).sum())
     return {
         "total": total,
         "tagged": tagged,
@@ -482,12 +1128,14 @@ def upload():
 
     # Stop any running tagging
     _state["stop_flag"].set()
-    _state["df"] = df
     _state["original_filename"] = file.filename
+    _state["_autosave_path"] = _autosave_path(file.filename)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    _publish_df(df)
     _state["_analysis_cache"] = None
-    _state["_chord_cache"] = None
+    _state["_chord_cache"] = OrderedDict()
     _state["_preview_cache"] = {}
-    _state["_artwork_cache"] = {}
+    _state["_artwork_cache"] = _ShardedLRU()
 
     # Persist autosave + metadata so refresh can restore
     _autosave()
@@ -512,12 +1160,15 @@ def restore():
         with open(_LAST_UPLOAD_META) as f:
             meta = json.load(f)
         original = meta.get("original_filename", "")
-        autosave = original.rsplit(".", 1)[0] + "_autosave.csv"
-        path = os.path.join(_OUTPUT_DIR, autosave)
-        if not os.path.exists(path):
+        # Plain and gzipped autosaves can coexist if the setting was toggled —
+        # restore whichever was written last
+        paths = [p for p in (_autosave_path(original),
+                             _autosave_path(original, compressed=True))
+                 if os.path.exists(p)]
+        if not paths:
             return jsonify({"restored": False})
 
-        df = pd.read_csv(path)
+        df = pd.read_csv(max(paths, key=os.path.getmtime))  # infers gzip
         missing = [c for c in ("title", "artist") if c not in df.columns]
         if missing:
             return jsonify({"restored": False})
@@ -525,12 +1176,13 @@ def restore():
         if "comment" not in df.columns:
             df["comment"] = ""
 
-        _state["df"] = df
         _state["original_filename"] = original
+        _state["_autosave_path"] = _autosave_path(original)
+        _publish_df(df)
         _state["_analysis_cache"] = None
-        _state["_chord_cache"] = None
+        _state["_chord_cache"] = OrderedDict()
         _state["_preview_cache"] = {}
-        _state["_artwork_cache"] = {}
+        _state["_artwork_cache"] = _ShardedLRU()
 
         result = _summary()
         result["restored"] = True
@@ -573,74 +1225,141 @@ def _tagging_worker():
         _caffeinate_stop()
 
 
+# Bulk tagging queues a background autosave after this many tagged tracks or
+# seconds, whichever comes first, and saves directly on stop and at the end
+_TAG_AUTOSAVE_EVERY = 25
+_TAG_AUTOSAVE_SECS = 10.0
+
+
 def _tagging_loop():
+    epoch = _df_epoch   # read before the frame: edits never reach a newer one
     df = _state["df"]
     config = load_config()
     model = config.get("model", "gpt-4")
     provider = _provider_for_model(model)
     client = _get_client(provider)
     delay = config.get("delay_between_requests", 1.5)
+    workers = max(1, int(config.get("tag_concurrency", 4)))
+    stop = _state["stop_flag"]
 
-    untagged = [(i, r) for i, r in df.iterrows()
-                if pd.isna(r.get("comment", "")) or str(r.get("comment", "")).strip() == ""]
-
-    total_untagged = len(untagged)
-    for count, (idx, row) in enumerate(untagged, 1):
-        if _state["stop_flag"].is_set():
-            _autosave()
-            _broadcast({"event": "stopped"})
-            return
-
-        try:
-            comment, detected_year = generate_genre_comment(
-                client=client,
-                title=row["title"],
-                artist=row["artist"],
-                system_prompt=config["system_prompt"],
-                user_prompt_template=config["user_prompt_template"],
-                bpm=str(row.get("bpm", "")),
-                key=str(row.get("key", "")),
-                year=str(row.get("year", "")),
-                model=model,
-                provider=provider,
-            )
-            df.at[idx, "comment"] = comment
-            if detected_year:
-                df.at[idx, "year"] = int(detected_year)
-            _autosave()
-            status = "tagged"
-        except Exception:
-            logging.exception("Tagging failed for track %s – %s", row["title"], row["artist"])
-            status = "error"
+    if "comment" in df.columns:
+        comments = df["comment"]
+        mask = comments.isna() | (comments.astype(str).str.strip() == "")
+    else:
+        mask = pd.Series(True, index=df.index)
+    total_untagged = int(mask.sum())
+
+    # Requests still start at least ``delay`` apart (the configured rate
+    # limit), but up to ``workers`` are in flight at once, so a slow response
+    # no longer holds back the next track.
+    pace_lock = threading.Lock()
+    next_start = time.monotonic()
+
+    def tag(row):
+        nonlocal next_start
+        with pace_lock:
+            now = time.monotonic()
+            start = max(now, next_start)
+            next_start = start + delay
+        if start > now:
+            stop.wait(start - now)
+        if stop.is_set():
+            return None
+        return generate_genre_comment(
+            client=client,
+            title=row["title"],
+            artist=row["artist"],
+            system_prompt=config["system_prompt"],
+            user_prompt_template=config["user_prompt_template"],
+            bpm=str(row.get("bpm", "")),
+            key=str(row.get("key", "")),
+            year=str(row.get("year", "")),
+            model=model,
+            provider=provider,
+        )
 
-        _broadcast({
-            "event": "progress",
-            "id": int(idx),
-            "title": row["title"],
-            "artist": row["artist"],
-            "comment": df.at[idx, "comment"] if status == "tagged" else "",
-            "year": int(df.at[idx, "year"]) if status == "tagged" else "",
-            "status": status,
-            "progress": f"{count}/{total_untagged}",
-        })
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Published frames are immutable, so rows come straight from this
+        # snapshot while results are published as new frames
+        futures = {pool.submit(tag, row): (idx, row)
+                   for idx, row in df[mask].iterrows()}
+        unsaved, last_save = 0, time.monotonic()
+        for count, future in enumerate(as_completed(futures), 1):
+            if stop.is_set():
+                _autosave()
+                _broadcast({"event": "stopped"})
+                return
+
+            idx, row = futures[future]
+            try:
+                result = future.result()
+                if result is None:      # stopped before its request started
+                    continue
+                comment, detected_year = result
+                fields = {"comment": comment}
+                if detected_year:
+                    fields["year"] = int(detected_year)
+                if _set_track_fields(idx, epoch=epoch, **fields) is None:
+                    # A new file was uploaded mid-request — drop the stale result
+                    _broadcast({"event": "stopped"})
+                    return
+                # Each result is published at once (progress events and
+                # /api/tracks read it), but the full CSV rewrite is batched
+                unsaved += 1
+                if (unsaved >= _TAG_AUTOSAVE_EVERY
+                        or time.monotonic() - last_save >= _TAG_AUTOSAVE_SECS):
+                    _schedule_autosave()
+                    unsaved, last_save = 0, time.monotonic()
+                status = "tagged"
+            except Exception:
+                logging.exception("Tagging failed for track %s – %s", row["title"], row["artist"])
+                status = "error"
 
-        if count < total_untagged and not _state["stop_flag"].is_set():
-            time.sleep(delay)
+            df = _state["df"]
+            _broadcast({
+                "event": "progress",
+                "id": int(idx),
+                "title": row["title"],
+                "artist": row["artist"],
+                "comment": df.at[idx, "comment"] if status == "tagged" else "",
+                "year": int(df.at[idx, "year"]) if status == "tagged" else "",
+                "status": status,
+                "progress": f"{count}/{total_untagged}",
+            })
+    finally:
+        # Drop queued tracks on stop; in-flight calls finish unobserved
+        pool.shutdown(wait=False, cancel_futures=True)
 
     _autosave()
     _broadcast({"event": "done"})
 
 
-def _broadcast(data):
-    import queue
-    dead = []
-    for q in _state["progress_listeners"]:
+def _fan_out(listeners, data):
+    """Push an event to every SSE listener without blocking the producer.
+
+    The payload is encoded once here as an ``(event, bytes)`` pair rather
+    than once per listener in each stream. A listener that has fallen behind
+    sheds its oldest queued event instead of being dropped, so it still
+    receives the terminal done/error event.
+    """
+    item = (data.get("event"), b"data: " + _json_dumps(data) + b"\n\n")
+    for q in list(listeners):
         try:
-            q.put_nowait(data)
+            q.put_nowait(item)
         except queue.Full:
-            dead.append(q)
-    for q in dead:
-        _state["progress_listeners"].remove(q)
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(item)
+            except queue.Full:
+                pass
+
+
+def _broadcast(data):
+    _fan_out(_state["progress_listeners"], data)
 
 
 # ---------------------------------------------------------------------------
@@ -648,7 +1367,6 @@ def _broadcast(data):
 # ---------------------------------------------------------------------------
 @api.route("/api/tag/progress")
 def tag_progress():
-    import queue
     q = queue.Queue(maxsize=100)
     _state["progress_listeners"].append(q)
 
@@ -656,12 +1374,12 @@ def tag_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"  # keep-alive
+                    yield b":\n\n"  # keep-alive
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "stopped"):
+                yield payload
+                if event in ("done", "stopped"):
                     break
         finally:
             if q in _state["progress_listeners"]:
@@ -685,6 +1403,7 @@ def tag_stop():
 # ---------------------------------------------------------------------------
 @api.route("/api/tag/<int:track_id>", methods=["POST"])
 def tag_single(track_id):
+    epoch = _df_epoch   # read before the frame: edits never reach a newer one
     df = _state["df"]
     if df is None or track_id not in df.index:
         return jsonify({"error": "Track not found"}), 404
@@ -708,12 +1427,12 @@ def tag_single(track_id):
             model=model,
             provider=provider,
         )
-        df.at[track_id, "comment"] = comment
-        result = {"id": track_id, "comment": comment}
+        fields = {"comment": comment}
         if detected_year:
-            df.at[track_id, "year"] = int(detected_year)
-            result["year"] = int(detected_year)
-        return jsonify(result)
+            fields["year"] = int(detected_year)
+        if _set_track_fields(track_id, epoch=epoch, **fields) is None:
+            return jsonify({"error": "Library changed while tagging"}), 409
+        return jsonify({"id": track_id, **fields})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -723,12 +1442,18 @@ def tag_single(track_id):
 # ---------------------------------------------------------------------------
 @api.route("/api/track/<int:track_id>", methods=["PUT"])
 def update_track(track_id):
+    epoch = _df_epoch   # read before the frame: edits never reach a newer one
     df = _state["df"]
     if df is None or track_id not in df.index:
         return jsonify({"error": "Track not found"}), 404
 
     data = request.get_json()
-    df.at[track_id, "comment"] = data.get("comment", "")
+    df = _set_track_fields(track_id, epoch=epoch,
+                           comment=data.get("comment", ""))
+    if df is None:
+        return jsonify({"error": "Library changed; reload and retry"}), 409
+    if track_id not in df.index:
+        return jsonify({"error": "Track not found"}), 404
     return jsonify({"id": track_id, "comment": df.at[track_id, "comment"]})
 
 
@@ -737,11 +1462,16 @@ def update_track(track_id):
 # ---------------------------------------------------------------------------
 @api.route("/api/track/<int:track_id>/clear", methods=["POST"])
 def clear_track(track_id):
+    epoch = _df_epoch   # read before the frame: edits never reach a newer one
     df = _state["df"]
     if df is None or track_id not in df.index:
         return jsonify({"error": "Track not found"}), 404
 
-    df.at[track_id, "comment"] = ""
+    df = _set_track_fields(track_id, epoch=epoch, comment="")
+    if df is None:
+        return jsonify({"error": "Library changed; reload and retry"}), 409
+    if track_id not in df.index:
+        return jsonify({"error": "Track not found"}), 404
     return jsonify({"id": track_id, "comment": ""})
 
 
@@ -753,7 +1483,12 @@ def clear_all():
     df = _state["df"]
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
-    df["comment"] = ""
+
+    def clear_comments(d):
+        d["comment"] = ""
+        reparse_comments(d, d.index)
+
+    _update_df(clear_comments)
     return jsonify({"cleared": True})
 
 
@@ -790,12 +1525,14 @@ def update_config():
     config = load_config()
     config.update(data)
     save_config(config)
+    _audio_path_cache.clear()
     return jsonify(config)
 
 
 @api.route("/api/config/reset", methods=["POST"])
 def reset_config():
     save_config(dict(DEFAULT_CONFIG))
+    _audio_path_cache.clear()
     return jsonify(DEFAULT_CONFIG)
 
 
@@ -803,17 +1540,55 @@ def reset_config():
 # Playlist Workshop endpoints
 # ═══════════════════════════════════════════════════════════════════════════
 
+_parsed_epoch = None   # _df_epoch whose frames are known to carry facet columns
+_parse_lock = threading.Lock()   # one facet parse at a time
+
+
 def _ensure_parsed():
     """Ensure facet columns exist on the DataFrame. Returns df or None."""
+    global _parsed_epoch
+    # _parsed_epoch is only set once a parsed frame is published, and every
+    # later frame in that epoch derives from it; comment edits re-parse their
+    # own rows (_set_track_fields, clear_all), so facets stay current. The
+    # column check keeps the fast path honest should a frame lose them.
+    parsed = _parsed_epoch
     df = _state["df"]
     if df is None:
         return None
-    parse_all_comments(df)
+    if parsed == _df_epoch and "_genre1" in df.columns:
+        return df
+    # Readers never lock (published frames are immutable). The parse runs on
+    # a private copy under _parse_lock only, so row edits keep flowing while
+    # it works; a racing caller that waited finds the columns already there.
+    if "_genre1" not in df.columns:
+        with _parse_lock:
+            df = _state["df"]
+            if df is not None and "_genre1" not in df.columns:
+                work = df.copy(deep=False)
+                parse_all_comments(work)
+                if _replace_df_if(df, work):
+                    df = work
+                else:
+                    # A row edit landed mid-parse: parse its frame under the
+                    # write lock so the edit isn't lost
+                    df = _update_df(parse_all_comments,
+                                    needed=lambda d: "_genre1" not in d.columns)
+    with _df_write_lock:
+        current = _state["df"]
+        if current is not None and "_genre1" in current.columns:
+            _parsed_epoch = _df_epoch
     return df
 
 
 def _safe_val(val):
     """Convert numpy/pandas types to JSON-safe Python types."""
+    # Common cell types first, so only exotic values pay for pd.isna
+    if val is None:
+        return ""
+    if isinstance(val, (str, int)):
+        return val
+    if isinstance(val, float):  # includes numpy.float64
+        return "" if val != val else float(val)
     if pd.isna(val):
         return ""
     if hasattr(val, "item"):  # numpy scalar
@@ -821,34 +1596,107 @@ def _safe_val(val):
     return val
 
 
+# (df, public columns, id -> JSON-safe record) for the last frame seen.
+# Published frames are immutable, so records stay valid until a new frame
+# replaces it; racing threads at worst rebuild an entry twice.
+_track_records_memo = (None, [], {})
+
+
+def _track_records(df, ids):
+    """Public-column dicts for ``ids`` (NaN as ""), memoised per DataFrame.
+
+    Returns the memo's id -> record mapping; ids not in ``df`` are absent.
+    """
+    global _track_records_memo
+    memo_df, cols, rows = _track_records_memo
+    if memo_df is not df:
+        cols = [c for c in df.columns if not c.startswith("_")]
+        rows = {}
+        _track_records_memo = (df, cols, rows)
+    missing = [idx for idx in dict.fromkeys(ids) if idx not in rows]
+    if missing:
+        # Drop ids the frame lacks in one vectorised index intersection, then
+        # gather the block at once instead of a Series per row; to_dict
+        # ("records") returns native Python scalars, and NaN cells become ""
+        # like _safe_val
+        present = df.index.intersection(missing)
+        if len(present):
+            sub = df.loc[present, cols]
+            records = sub.astype(object).where(sub.notna(), "").to_dict("records")
+            rows.update(zip(present.tolist(), records))
+    return rows
+
+
+# Memo of scored_search results for the current published frame:
+# (df, OrderedDict of (filters JSON, min_score, max_results) -> results)
+_SCORED_CACHE_MAX = 128
+_scored_cache = (None, OrderedDict())
+_scored_cache_lock = threading.Lock()
+
+
+def _scored_search_cached(df, filters, min_score=0.0, max_results=200):
+    """``scored_search`` memoised per published DataFrame.
+
+    The returned list is shared between callers and must not be mutated.
+    """
+    global _scored_cache
+    try:
+        key = (json.dumps(filters, sort_keys=True), min_score, max_results)
+    except TypeError:
+        return scored_search(df, filters, min_score=min_score,
+                             max_results=max_results)
+    with _scored_cache_lock:
+        memo_df, entries = _scored_cache
+        if memo_df is df and key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+    results = scored_search(df, filters, min_score=min_score,
+                            max_results=max_results)
+    with _scored_cache_lock:
+        memo_df, entries = _scored_cache
+        if memo_df is not df:
+            if df is not _state["df"]:
+                return results  # stale frame: don't evict the live memo
+            entries = OrderedDict()
+            _scored_cache = (df, entries)
+        entries[key] = results
+        while len(entries) > _SCORED_CACHE_MAX:
+            entries.popitem(last=False)
+    return results
+
+
 def _tracks_from_ids(df, ids):
     """Build a JSON-safe list of track dicts from row indices."""
-    result = []
-    for idx in ids:
-        if idx not in df.index:
-            continue
-        row = df.loc[idx]
-        track = {"id": int(idx)}
-        for col in df.columns:
-            if not col.startswith("_"):
-                track[col] = _safe_val(row[col])
-        result.append(track)
-    return result
+    rows = _track_records(df, ids)
+    return [{"id": int(idx), **rows[idx]} for idx in ids if idx in rows]
+
+
+_analysis_lock = threading.Lock()
 
 
 def _get_analysis():
     """Return cached analysis data, computing if needed."""
-    if _state["_analysis_cache"] is not None:
-        return _state["_analysis_cache"]
-    df = _ensure_parsed()
-    if df is None:
-        return None
-    _state["_analysis_cache"] = {
-        "cooccurrence": build_genre_cooccurrence(df),
-        "landscape_summary": build_genre_landscape_summary(df),
-        "facet_options": build_facet_options(df),
-    }
-    return _state["_analysis_cache"]
+    # Hits are a lock-free read of one (epoch, data) tuple; an entry from an
+    # earlier upload simply stops matching. Only a miss takes the lock, so
+    # concurrent first requests compute the analysis once.
+    cached = _state["_analysis_cache"]
+    if cached is not None and cached[0] == _df_epoch:
+        return cached[1]
+    with _analysis_lock:
+        cached = _state["_analysis_cache"]
+        if cached is not None and cached[0] == _df_epoch:
+            return cached[1]
+        epoch = _df_epoch
+        df = _ensure_parsed()
+        if df is None:
+            return None
+        analysis = {
+            "cooccurrence": build_genre_cooccurrence(df),
+            "landscape_summary": build_genre_landscape_summary(df),
+            "facet_options": build_facet_options(df),
+        }
+        _state["_analysis_cache"] = (epoch, analysis)
+    return analysis
 
 
 # ---------------------------------------------------------------------------
@@ -865,9 +1713,15 @@ def workshop_analysis():
 # ---------------------------------------------------------------------------
 # GET /api/workshop/chord-data
 # ---------------------------------------------------------------------------
+# Recent views, so flipping between trees/thresholds stays cached
+_CHORD_CACHE_MAX = 8
+_chord_cache_lock = threading.Lock()
+
+
 @api.route("/api/workshop/chord-data")
 def workshop_chord_data():
     """Build chord diagram data from tree lineages."""
+    epoch = _df_epoch  # read before the frame, like _get_analysis
     df = _ensure_parsed()
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
@@ -892,14 +1746,21 @@ def workshop_chord_data():
                         "Build one in the Collection Tree tab first."}), 404
 
     # Check cache
-    cache_key = f"{tree_type}_{threshold}_{max_lineages}"
-    cached = _state.get("_chord_cache")
-    if cached and cached.get("_key") == cache_key:
-        return jsonify(cached["data"])
+    cache_key = (epoch, f"{tree_type}_{threshold}_{max_lineages}")
+    with _chord_cache_lock:
+        cache = _state["_chord_cache"]
+        data = cache.get(cache_key)
+        if data is not None:
+            cache.move_to_end(cache_key)
+            return jsonify(data)
 
     data = build_chord_data(df, tree, threshold=threshold,
                             max_lineages=max_lineages)
-    _state["_chord_cache"] = {"_key": cache_key, "data": data}
+    with _chord_cache_lock:
+        cache = _state["_chord_cache"]
+        cache[cache_key] = data
+        while len(cache) > _CHORD_CACHE_MAX:
+            cache.popitem(last=False)
     return jsonify(data)
 
 
@@ -935,19 +1796,13 @@ def workshop_scored_search():
     min_score = body.get("min_score", 0.15)
     max_results = body.get("max_results", 200)
 
-    scored_results = scored_search(df, filters, min_score=min_score,
-                                   max_results=max_results)
+    scored_results = _scored_search_cached(df, filters, min_score=min_score,
+                                           max_results=max_results)
 
-    tracks = []
-    for idx, score, matched_facets in scored_results:
-        if idx not in df.index:
-            continue
-        row = df.loc[idx]
-        track = {"id": int(idx), "score": score, "matched": matched_facets}
-        for col in df.columns:
-            if not col.startswith("_"):
-                track[col] = _safe_val(row[col])
-        tracks.append(track)
+    rows = _track_records(df, [idx for idx, _, _ in scored_results])
+    tracks = [{"id": int(idx), "score": score, "matched": matched_facets,
+               **rows[idx]}
+              for idx, score, matched_facets in scored_results if idx in rows]
 
     return jsonify({
         "count": len(tracks),
@@ -1008,6 +1863,13 @@ def workshop_rerank():
 # ---------------------------------------------------------------------------
 # POST /api/workshop/suggest
 # ---------------------------------------------------------------------------
+# Prompt line per seed track in workshop_suggest's seed mode
+_SEED_LINE = "- {} — {} (BPM: {}, Key: {}, Comment: {})"
+_SEED_DEFAULTS = {"artist": "?", "title": "?", "bpm": "?", "key": "?",
+                  "comment": ""}
+_seed_fields = operator.itemgetter("artist", "title", "bpm", "key", "comment")
+
+
 @api.route("/api/workshop/suggest", methods=["POST"])
 def workshop_suggest():
     df = _ensure_parsed()
@@ -1040,9 +1902,7 @@ def workshop_suggest():
                 return jsonify({"error": "seed_track_ids is required for seed mode"}), 400
             seed_tracks = _tracks_from_ids(df, seed_ids)
             seed_details = "\n".join(
-                f"- {t.get('artist', '?')} — {t.get('title', '?')} "
-                f"(BPM: {t.get('bpm', '?')}, Key: {t.get('key', '?')}, "
-                f"Comment: {t.get('comment', '')})"
+                _SEED_LINE.format(*_seed_fields({**_SEED_DEFAULTS, **t}))
                 for t in seed_tracks
             )
             suggestions = generate_seed_suggestions(
@@ -1067,13 +1927,18 @@ def workshop_suggest():
             if not l1_title or not l2_title:
                 return jsonify({"error": "lineage titles required"}), 400
             # Find tracks scoring well for both lineages
-            r1 = scored_search(df, l1_filters, min_score=0.08,
-                               max_results=len(df))
-            r2 = scored_search(df, l2_filters, min_score=0.08,
-                               max_results=len(df))
-            shared = {i for i, _, _ in r1} & {i for i, _, _ in r2}
+            r1 = _scored_search_cached(df, l1_filters, min_score=0.08,
+                                       max_results=len(df))
+            r2 = _scored_search_cached(df, l2_filters, min_score=0.08,
+                                       max_results=len(df))
+            # Only the count is needed: hash the shorter list once and
+            # stream the longer one through it instead of building two sets
+            if len(r2) < len(r1):
+                r1, r2 = r2, r1
+            ids1 = {i for i, _, _ in r1}
+            shared_count = sum(1 for i, _, _ in r2 if i in ids1)
             suggestions = generate_intersection_suggestions(
-                landscape, l1_title, l2_title, len(shared),
+                landscape, l1_title, l2_title, shared_count,
                 client, model, provider, num
             )
         else:
@@ -1087,30 +1952,35 @@ def workshop_suggest():
 
     # Enrich each suggestion with track count and samples (using scored search)
     for s in suggestions:
-        try:
-            scored_results = scored_search(df, s["filters"], min_score=0.1,
-                                           max_results=100)
-            s["track_count"] = len(scored_results)
-            sample_ids = [r[0] for r in scored_results[:5]]
-            samples = _tracks_from_ids(df, sample_ids)
-            score_map = {r[0]: r[1] for r in scored_results[:5]}
-            s["sample_tracks"] = [
-                {
-                    "id": t["id"],
-                    "title": t.get("title", ""),
-                    "artist": t.get("artist", ""),
-                    "year": t.get("year", ""),
-                    "score": score_map.get(t["id"], 0),
-                }
-                for t in samples
-            ]
-        except Exception:
-            s["track_count"] = 0
-            s["sample_tracks"] = []
+        _enrich_suggestion(df, s)
 
     return jsonify({"suggestions": suggestions})
 
 
+def _enrich_suggestion(df, s):
+    """Add track_count and sample_tracks to one playlist suggestion."""
+    try:
+        scored_results = _scored_search_cached(
+            df, s["filters"], min_score=0.1, max_results=100)
+        s["track_count"] = len(scored_results)
+        sample_ids = [r[0] for r in scored_results[:5]]
+        samples = _tracks_from_ids(df, sample_ids)
+        score_map = {r[0]: r[1] for r in scored_results[:5]}
+        s["sample_tracks"] = [
+            {
+                "id": t["id"],
+                "title": t.get("title", ""),
+                "artist": t.get("artist", ""),
+                "year": t.get("year", ""),
+                "score": score_map.get(t["id"], 0),
+            }
+            for t in samples
+        ]
+    except Exception:
+        s["track_count"] = 0
+        s["sample_tracks"] = []
+
+
 # ---------------------------------------------------------------------------
 # Playlist CRUD
 # ---------------------------------------------------------------------------
@@ -1161,7 +2031,8 @@ def workshop_smart_create_playlist():
     client = _get_client(provider)
 
     # Step 1: Scored search to find candidates
-    scored_results = scored_search(df, filters, min_score=0.1, max_results=80)
+    scored_results = _scored_search_cached(df, filters, min_score=0.1,
+                                           max_results=80)
 
     if not scored_results:
         # Fallback: create empty playlist
@@ -1246,6 +2117,31 @@ def workshop_remove_tracks(playlist_id):
 # Export
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=256)
+def _attachment_disposition(download_name):
+    """Content-Disposition value for a streamed download, encoded the way
+    ``send_file(as_attachment=True)`` does it (RFC 5987 for non-ASCII).
+    Cached: repeat downloads of a playlist reuse the same string."""
+    try:
+        download_name.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", download_name)
+        simple = simple.encode("ascii", "ignore").decode("ascii")
+        quoted = urllib.parse.quote(download_name, safe="!#$&+-.^_`|~")
+        names = {"filename": simple, "filename*": f"UTF-8''{quoted}"}
+    else:
+        names = {"filename": download_name}
+    return dump_options_header("attachment", names)
+
+
+def _m3u_download(df, track_ids, name):
+    """Streamed ``<name>.m3u8`` attachment for ``track_ids``."""
+    safe_name = name.replace(" ", "_")
+    return Response(m3u_iter(df, track_ids, name), mimetype="audio/x-mpegurl",
+                    headers={"Content-Disposition":
+                             _attachment_disposition(f"{safe_name}.m3u8")})
+
+
 @api.route("/api/workshop/playlists/<playlist_id>/export/m3u")
 def workshop_export_m3u(playlist_id):
     """Export playlist as .m3u8 (UTF-8 M3U, Lexicon-compatible)."""
@@ -1253,16 +2149,16 @@ def workshop_export_m3u(playlist_id):
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    content = export_m3u(playlist_id, df)
-    if content is None:
+    chunks = export_m3u_iter(playlist_id, df)
+    if chunks is None:
         return jsonify({"error": "Playlist not found"}), 404
 
     p = get_playlist(playlist_id)
     name = (p["name"] if p else "playlist").replace(" ", "_")
 
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{name}.m3u8")
+    return Response(chunks, mimetype="audio/x-mpegurl",
+                    headers={"Content-Disposition":
+                             _attachment_disposition(f"{name}.m3u8")})
 
 
 @api.route("/api/workshop/playlists/<playlist_id>/export/csv")
@@ -1271,15 +2167,17 @@ def workshop_export_csv(playlist_id):
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    buf = export_csv(playlist_id, df)
-    if buf is None:
+    # df is an immutable published snapshot, so streaming it needs no lock
+    chunks = export_csv_iter(playlist_id, df)
+    if chunks is None:
         return jsonify({"error": "Playlist not found"}), 404
 
     p = get_playlist(playlist_id)
     name = (p["name"] if p else "playlist").replace(" ", "_")
 
-    return send_file(buf, mimetype="text/csv", as_attachment=True,
-                     download_name=f"{name}.csv")
+    return Response(chunks, mimetype="text/csv",
+                    headers={"Content-Disposition":
+                             _attachment_disposition(f"{name}.csv")})
 
 
 # ---------------------------------------------------------------------------
@@ -1301,8 +2199,10 @@ def workshop_import_playlist():
     if not fname.lower().endswith((".m3u", ".m3u8")):
         return jsonify({"error": "Only .m3u / .m3u8 files are supported"}), 400
 
-    content = file.read().decode("utf-8", errors="replace")
-    result = import_m3u(content, fname, df)
+    # Decode while reading lines instead of holding the raw bytes and a
+    # decoded copy of the whole file
+    lines = codecs.getreader("utf-8")(file.stream, errors="replace")
+    result = import_m3u(lines, fname, df)
 
     if "error" in result:
         return jsonify(result), 400
@@ -1315,15 +2215,7 @@ def workshop_import_playlist():
 # ═══════════════════════════════════════════════════════════════════════════
 
 def _tree_broadcast(data, listeners_key="tree_progress_listeners"):
-    import queue
-    dead = []
-    for q in _state[listeners_key]:
-        try:
-            q.put_nowait(data)
-        except queue.Full:
-            dead.append(q)
-    for q in dead:
-        _state[listeners_key].remove(q)
+    _fan_out(_state[listeners_key], data)
 
 
 # ---------------------------------------------------------------------------
@@ -1402,7 +2294,6 @@ def tree_build():
 # ---------------------------------------------------------------------------
 @api.route("/api/tree/progress")
 def tree_progress():
-    import queue
     q = queue.Queue(maxsize=100)
     _state["tree_progress_listeners"].append(q)
 
@@ -1410,12 +2301,12 @@ def tree_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"  # keep-alive
+                    yield b":\n\n"  # keep-alive
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "error", "stopped"):
+                yield payload
+                if event in ("done", "error", "stopped"):
                     break
         finally:
             if q in _state["tree_progress_listeners"]:
@@ -1687,23 +2578,7 @@ def tree_node_export_m3u(node_id):
     track_ids = node.get("track_ids", [])
     title = node.get("title", "Untitled")
 
-    lines = ["#EXTM3U", f"#PLAYLIST:{title}"]
-    for tid in track_ids:
-        if tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        track_title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {track_title}")
-        if location and location != "nan":
-            lines.append(location)
-
-    content = "\n".join(lines) + "\n"
-    name = title.replace(" ", "_")
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{name}.m3u8")
+    return _m3u_download(df, track_ids, title)
 
 
 # ---------------------------------------------------------------------------
@@ -1803,7 +2678,6 @@ def scene_tree_build():
 # ---------------------------------------------------------------------------
 @api.route("/api/scene-tree/progress")
 def scene_tree_progress():
-    import queue
     q = queue.Queue(maxsize=100)
     _state["scene_tree_progress_listeners"].append(q)
 
@@ -1811,12 +2685,12 @@ def scene_tree_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"
+                    yield b":\n\n"
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "error", "stopped"):
+                yield payload
+                if event in ("done", "error", "stopped"):
                     break
         finally:
             if q in _state["scene_tree_progress_listeners"]:
@@ -2074,23 +2948,7 @@ def scene_tree_node_export_m3u(node_id):
     track_ids = node.get("track_ids", [])
     title = node.get("title", "Untitled")
 
-    lines = ["#EXTM3U", f"#PLAYLIST:{title}"]
-    for tid in track_ids:
-        if tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        track_title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {track_title}")
-        if location and location != "nan":
-            lines.append(location)
-
-    content = "\n".join(lines) + "\n"
-    name = title.replace(" ", "_")
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{name}.m3u8")
+    return _m3u_download(df, track_ids, title)
 
 
 # ---------------------------------------------------------------------------
@@ -2216,7 +3074,6 @@ def collection_tree_build():
 # ---------------------------------------------------------------------------
 @api.route("/api/collection-tree/progress")
 def collection_tree_progress():
-    import queue
     q = queue.Queue(maxsize=100)
     _state["collection_tree_progress_listeners"].append(q)
 
@@ -2224,12 +3081,12 @@ def collection_tree_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"
+                    yield b":\n\n"
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "error", "stopped"):
+                yield payload
+                if event in ("done", "error", "stopped"):
                     break
         finally:
             if q in _state["collection_tree_progress_listeners"]:
@@ -2373,23 +3230,7 @@ def collection_tree_node_export_m3u(node_id):
     track_ids = node.get("track_ids", [])
     title = node.get("title", "Untitled")
 
-    lines = ["#EXTM3U", f"#PLAYLIST:{title}"]
-    for tid in track_ids:
-        if tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        track_title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {track_title}")
-        if location and location != "nan":
-            lines.append(location)
-
-    content = "\n".join(lines) + "\n"
-    name = title.replace(" ", "_")
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{name}.m3u8")
+    return _m3u_download(df, track_ids, title)
 
 
 # ---------------------------------------------------------------------------
@@ -2413,29 +3254,26 @@ def get_preview():
     if not artist or not title:
         return jsonify({"error": "artist and title are required"}), 400
 
-    cache_key = f"{artist.lower()}||{title.lower()}"
+    cache_key = _artwork_key(artist, title)
     cached = _state["_preview_cache"].get(cache_key)
     if cached is not None:
         return jsonify(cached)
 
-    query = urllib.parse.quote(f"{artist} {title}")
+    query = _quote_query(artist, title)
     url = f"https://api.deezer.com/search?q={query}&limit=5"
     result = {"preview_url": None, "found": False}
 
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "GenreTagger/1.0"})
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = _http_get_json(url, timeout=5)
 
         tracks = data.get("data", [])
         if tracks:
             best = None
-            a_low, t_low = artist.lower(), title.lower()
+            a_low, t_low = _norm(artist), _norm(title)
             for t in tracks:
-                d_artist = (t.get("artist", {}).get("name") or "").lower()
-                d_title = (t.get("title") or "").lower()
-                if (a_low in d_artist or d_artist in a_low) and \
-                   (t_low in d_title or d_title in t_low):
+                d_artist = _norm(t.get("artist", {}).get("name") or "")
+                d_title = _norm(t.get("title") or "")
+                if _match(a_low, d_artist, t_low, d_title):
                     best = t
                     break
             if best is None:
@@ -2469,19 +3307,78 @@ def get_preview():
 # ---------------------------------------------------------------------------
 _NOT_FOUND_RETRY_SECS = 86400      # retry not-found lookups after 24h
 
+_MTIME_TTL = 1.0                   # seconds a cache-buster mtime is reused
+_MTIME_CACHE_MAX = 50_000
+_artwork_mtimes = {}               # fname -> (expires_at, mtime)
+
+
 def _artwork_url(fname):
     """Return artwork URL with mtime cache-buster."""
-    fpath = os.path.join(_ARTWORK_DIR, fname)
-    try:
-        v = int(os.path.getmtime(fpath))
-    except OSError:
-        v = 0
+    now = time.monotonic()
+    hit = _artwork_mtimes.get(fname)
+    if hit is not None and hit[0] > now:
+        v = hit[1]
+    else:
+        try:
+            v = int(os.path.getmtime(os.path.join(_ARTWORK_DIR, fname)))
+        except OSError:
+            v = 0
+        if len(_artwork_mtimes) >= _MTIME_CACHE_MAX:
+            _artwork_mtimes.clear()
+        _artwork_mtimes[fname] = (now + _MTIME_TTL, v)
     return f"/artwork/{fname}?v={v}"
 
 
+_ARTWORK_LISTING_TTL = 2.0        # seconds a directory snapshot is reused
+_artwork_listing = (0.0, frozenset())
+
+
+def _artwork_files(max_age=_ARTWORK_LISTING_TTL):
+    """Names of the files in the artwork dir, from a single scandir shared
+    for up to ``max_age`` seconds (one directory read instead of a stat per
+    track in the batch/bulk paths)."""
+    global _artwork_listing
+    ts, names = _artwork_listing
+    now = time.monotonic()
+    if now - ts > max_age:
+        try:
+            with os.scandir(_ARTWORK_DIR) as it:
+                names = frozenset(e.name for e in it)
+        except OSError:
+            names = frozenset()
+        _artwork_listing = (now, names)
+    return names
+
+
+# Single-flight: concurrent lookups of the same key (UI scrolling, batch
+# route and warm-cache overlapping) share one Deezer round-trip.
+_artwork_inflight = {}            # cache_key -> Future
+_artwork_inflight_lock = threading.Lock()
+
+
 def _lookup_artwork(artist, title):
     """Look up artwork for a single track. Returns dict with cover_url/found."""
-    cache_key = f"{artist.lower()}||{title.lower()}"
+    cache_key = _artwork_key(artist, title)
+    with _artwork_inflight_lock:
+        fut = _artwork_inflight.get(cache_key)
+        owner = fut is None
+        if owner:
+            fut = _artwork_inflight[cache_key] = Future()
+    if not owner:
+        return fut.result()
+    try:
+        result = _lookup_artwork_once(artist, title, cache_key)
+        fut.set_result(result)
+        return result
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    finally:
+        with _artwork_inflight_lock:
+            _artwork_inflight.pop(cache_key, None)
+
+
+def _lookup_artwork_once(artist, title, cache_key):
 
     # Disk-first: if local files exist, trust them (survives cache corruption)
     small_fname = _artwork_filename(cache_key, "small")
@@ -2512,24 +3409,33 @@ def _lookup_artwork(artist, title):
             _ensure_local_artwork(cached, cache_key)
             return cached
 
-    query = urllib.parse.quote(f"{artist} {title}")
+    query = _quote_query(artist, title)
     url = f"https://api.deezer.com/search?q={query}&limit=5"
     result = {"cover_url": "", "found": False, "_ts": time.time()}
 
+    # Expired not-found entry: revalidate, so an unchanged search costs a 304
+    headers = {}
+    if cached is not None and cached.get("_etag"):
+        headers["If-None-Match"] = cached["_etag"]
+
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "GenreTagger/1.0"})
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        resp = _http_request(url, timeout=5, headers=headers)
+        if resp.status == 304:
+            result = {**cached, "_ts": result["_ts"]}
+            _state["_artwork_cache"][cache_key] = result
+            return result
+        data = _json_loads(resp.data)
+        if resp.headers.get("ETag"):
+            result["_etag"] = resp.headers["ETag"]
 
         tracks = data.get("data", [])
         if tracks:
             best = None
-            a_low, t_low = artist.lower(), title.lower()
+            a_low, t_low = _norm(artist), _norm(title)
             for t in tracks:
-                d_artist = (t.get("artist", {}).get("name") or "").lower()
-                d_title = (t.get("title") or "").lower()
-                if (a_low in d_artist or d_artist in a_low) and \
-                   (t_low in d_title or d_title in t_low):
+                d_artist = _norm(t.get("artist", {}).get("name") or "")
+                d_title = _norm(t.get("title") or "")
+                if _match(a_low, d_artist, t_low, d_title):
                     best = t
                     break
             if best is None:
@@ -2555,18 +3461,38 @@ def _lookup_artwork(artist, title):
     return result
 
 
+def _link_artwork_local(local_url, cache_key, size):
+    """Make an already-downloaded image (``/artwork/<fname>``) available
+    under ``cache_key``'s filename too — hardlink, falling back to a copy."""
+    dst = os.path.join(_ARTWORK_DIR, _artwork_filename(cache_key, size))
+    if os.path.exists(dst):
+        return
+    src = os.path.join(_ARTWORK_DIR, local_url[len("/artwork/"):])
+    try:
+        os.link(src, dst)
+    except OSError:
+        try:
+            shutil.copyfile(src, dst)
+        except OSError:
+            logging.exception("Failed to copy artwork %s -> %s", src, dst)
+
+
 def _ensure_local_artwork(entry, cache_key):
     """If a cache entry still has CDN URLs, download locally and update in-place."""
     if not entry.get("found"):
         return
+    remote = [
+        (field, size) for field, size in [("cover_url", "small"), ("cover_big", "big")]
+        if entry.get(field) and not entry[field].startswith("/artwork/")
+    ]
+    if not remote:
+        return      # already local — the common case once the cache is warm
     changed = False
-    for field, size in [("cover_url", "small"), ("cover_big", "big")]:
-        url = entry.get(field, "")
-        if url and not url.startswith("/artwork/"):
-            local = _download_artwork_local(url, cache_key, size)
-            if local:
-                entry[field] = local
-                changed = True
+    for field, size in remote:
+        local = _download_artwork_local(entry[field], cache_key, size)
+        if local:
+            entry[field] = local
+            changed = True
     if changed:
         _state["_artwork_cache"][cache_key] = entry
 
@@ -2576,25 +3502,22 @@ def _ensure_local_artwork(entry, cache_key):
 # ---------------------------------------------------------------------------
 def _lookup_artwork_itunes(artist, title, cache_key):
     """Try iTunes Search API. Returns cache entry dict or None."""
-    query = urllib.parse.quote(f"{artist} {title}")
+    query = _quote_query(artist, title)
     url = f"https://itunes.apple.com/search?term={query}&media=music&limit=5"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "GenreTagger/1.0"})
-        with urllib.request.urlopen(req, timeout=8) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        data = _http_get_json(url, timeout=8)
 
         results = data.get("results", [])
         if not results:
             return None
 
         # Try to match artist/title
-        a_low, t_low = artist.lower(), title.lower()
+        a_low, t_low = _norm(artist), _norm(title)
         best = None
         for r in results:
-            r_artist = (r.get("artistName") or "").lower()
-            r_title = (r.get("trackName") or "").lower()
-            if (a_low in r_artist or r_artist in a_low) and \
-               (t_low in r_title or r_title in t_low):
+            r_artist = _norm(r.get("artistName") or "")
+            r_title = _norm(r.get("trackName") or "")
+            if _match(a_low, r_artist, t_low, r_title):
                 best = r
                 break
         if best is None:
@@ -2628,41 +3551,79 @@ def _lookup_artwork_itunes(artist, title, cache_key):
 # ---------------------------------------------------------------------------
 # Placeholder image generation (artist initials on coloured background)
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=8)
+def _placeholder_font(size):
+    """Load (once per size) the font used for placeholder initials."""
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size=size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+_PLACEHOLDER_PX = 600
+
+
+@functools.lru_cache(maxsize=256)
+def _placeholder_background(hue_byte):
+    """Solid 600px background for one of the 256 placeholder hues."""
+    import colorsys
+    from PIL import Image
+    # HSL to RGB (muted tones: saturation ~40%, lightness ~30%)
+    r, g, b = colorsys.hls_to_rgb(hue_byte / 255.0, 0.30, 0.40)
+    return Image.new("RGB", (_PLACEHOLDER_PX, _PLACEHOLDER_PX),
+                     (int(r * 255), int(g * 255), int(b * 255)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _placeholder_glyphs(initials):
+    """Centred initials rasterised once as an 8-bit mask.
+
+    Returns ``(mask, box)`` — the mask cropped to the ink and the box it
+    occupies on the 600px canvas — or ``None`` if nothing was drawn.
+    """
+    from PIL import Image, ImageDraw
+    px = _PLACEHOLDER_PX
+    mask = Image.new("L", (px, px), 0)
+    draw = ImageDraw.Draw(mask)
+    font = _placeholder_font(px // 3)
+    # Centre text
+    bbox = draw.textbbox((0, 0), initials, font=font)
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    x = (px - tw) // 2
+    y = (px - th) // 2 - bbox[1]
+    draw.text((x, y), initials, fill=255, font=font)
+    box = mask.getbbox()
+    if box is None:
+        return None
+    return mask.crop(box), box
+
+
 def _generate_placeholder(artist, title, cache_key):
     """Generate a placeholder image with artist initials. Returns cache entry."""
-    from PIL import Image, ImageDraw, ImageFont
+    from PIL import Image
 
     # Pick initials (up to 2 chars from artist name)
     words = (artist or "?").split()
     initials = "".join(w[0].upper() for w in words[:2]) if words else "?"
 
-    # Deterministic colour from cache_key hash
-    h = hashlib.md5(cache_key.encode()).hexdigest()
-    hue = int(h[:2], 16) / 255.0
-    # HSL to RGB (muted tones: saturation ~40%, lightness ~30%)
-    import colorsys
-    r, g, b = colorsys.hls_to_rgb(hue, 0.30, 0.40)
-    bg = (int(r * 255), int(g * 255), int(b * 255))
-
-    for size_name, px in [("small", 60), ("big", 600)]:
-        img = Image.new("RGB", (px, px), bg)
-        draw = ImageDraw.Draw(img)
-        # Use default font, scaled
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc",
-                                      size=px // 3)
-        except Exception:
-            font = ImageFont.load_default()
-        # Centre text
-        bbox = draw.textbbox((0, 0), initials, font=font)
-        tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        x = (px - tw) // 2
-        y = (px - th) // 2 - bbox[1]
-        draw.text((x, y), initials, fill=(255, 255, 255, 200), font=font)
-
+    # Deterministic colour from cache_key hash; background and glyphs are
+    # rendered once and composited here
+    img = _placeholder_background(int(_artwork_hash(cache_key)[:2], 16)).copy()
+    glyphs = _placeholder_glyphs(initials)
+    if glyphs is not None:
+        mask, box = glyphs
+        img.paste((255, 255, 255), box, mask)
+
+    # The small image is a downscale of the big one
+    small = img.resize((60, 60), Image.LANCZOS)
+    for size_name, im in [("small", small), ("big", img)]:
         fname = _artwork_filename(cache_key, size_name)
         local_path = os.path.join(_ARTWORK_DIR, fname)
-        img.save(local_path, "JPEG", quality=85)
+        tmp = f"{local_path}.{threading.get_ident()}.tmp"
+        im.save(tmp, "JPEG", quality=85, optimize=False, progressive=False)
+        os.replace(tmp, local_path)
+        _artwork_mtimes.pop(fname, None)
 
     return {
         "cover_url": f"/artwork/{_artwork_filename(cache_key, 'small')}",
@@ -2701,24 +3662,23 @@ def _retry_artwork_worker():
             chunk = not_found[i:i + BATCH]
 
             # Try iTunes in parallel
-            with ThreadPoolExecutor(max_workers=BATCH) as pool:
-                futures = {}
-                for cache_key, entry in chunk:
-                    parts = cache_key.split("||", 1)
-                    if len(parts) == 2:
-                        futures[pool.submit(
-                            _lookup_artwork_itunes, parts[0], parts[1], cache_key
-                        )] = cache_key
-
-                for fut in as_completed(futures):
-                    cache_key = futures[fut]
-                    try:
-                        result = fut.result()
-                        if result:
-                            _state["_artwork_cache"][cache_key] = result
-                            st["itunes_found"] += 1
-                    except Exception:
-                        pass
+            futures = {}
+            for cache_key, entry in chunk:
+                parts = cache_key.split("||", 1)
+                if len(parts) == 2:
+                    futures[_ARTWORK_POOL.submit(
+                        _lookup_artwork_itunes, parts[0], parts[1], cache_key
+                    )] = cache_key
+
+            for fut in as_completed(futures):
+                cache_key = futures[fut]
+                try:
+                    result = fut.result()
+                    if result:
+                        _state["_artwork_cache"][cache_key] = result
+                        st["itunes_found"] += 1
+                except Exception:
+                    pass
 
             # Generate placeholders for anything still not found
             for cache_key, _ in chunk:
@@ -2732,11 +3692,9 @@ def _retry_artwork_worker():
                     st["placeholders"] += 1
                 st["done"] += 1
 
-            if (i // BATCH) % 5 == 4:
-                _save_artwork_cache()
-            time.sleep(0.4)     # throttle iTunes API
+            _schedule_artwork_cache_save()
 
-        _save_artwork_cache()
+        _schedule_artwork_cache_save()
     except Exception:
         logging.exception("Retry artwork worker failed")
     finally:
@@ -2768,24 +3726,18 @@ def retry_not_found_status():
     return jsonify(_retry_artwork_state)
 
 
-_artwork_cache_dirty = 0          # count of unsaved new lookups
-
 @api.route("/api/artwork")
 def get_artwork():
-    global _artwork_cache_dirty
     artist = request.args.get("artist", "").strip()
     title = request.args.get("title", "").strip()
     if not artist or not title:
         return jsonify({"cover_url": None, "found": False}), 400
 
-    cache_key = f"{artist.lower()}||{title.lower()}"
+    cache_key = _artwork_key(artist, title)
     was_cached = cache_key in _state["_artwork_cache"]
     result = _lookup_artwork(artist, title)
     if not was_cached:
-        _artwork_cache_dirty += 1
-        if _artwork_cache_dirty >= 10:         # batch-save every 10 new entries
-            _save_artwork_cache()
-            _artwork_cache_dirty = 0
+        _schedule_artwork_cache_save()
     resp = jsonify(result)
     resp.headers["Cache-Control"] = "public, max-age=86400"   # 24h browser cache
     return resp
@@ -2802,20 +3754,20 @@ def get_artwork_batch():
     # Separate cached/on-disk from uncached
     results = {}
     uncached = []     # (key, artist, title)
+    on_disk = _artwork_files()
     for item in items:
         artist = (item.get("artist") or "").strip()
         title = (item.get("title") or "").strip()
         if not artist or not title:
             continue
-        key = f"{artist.lower()}||{title.lower()}"
+        key = _artwork_key(artist, title)
         # Disk-first: check local files
         small_fname = _artwork_filename(key, "small")
-        if os.path.exists(os.path.join(_ARTWORK_DIR, small_fname)):
+        if small_fname in on_disk:
             big_fname = _artwork_filename(key, "big")
-            big_path = os.path.join(_ARTWORK_DIR, big_fname)
             results[key] = {
                 "cover_url": _artwork_url(small_fname),
-                "cover_big": _artwork_url(big_fname) if os.path.exists(big_path)
+                "cover_big": _artwork_url(big_fname) if big_fname in on_disk
                              else _artwork_url(small_fname),
                 "found": True,
             }
@@ -2830,20 +3782,19 @@ def get_artwork_batch():
         else:
             uncached.append((key, artist, title))
 
-    # Fetch uncached items in parallel (max 8 concurrent Deezer calls)
+    # Fetch uncached items in parallel on the shared artwork pool
     if uncached:
-        with ThreadPoolExecutor(max_workers=8) as pool:
-            futures = {
-                pool.submit(_lookup_artwork, artist, title): key
-                for key, artist, title in uncached
-            }
-            for fut in as_completed(futures):
-                key = futures[fut]
-                try:
-                    results[key] = fut.result()
-                except Exception:
-                    results[key] = {"cover_url": "", "found": False}
-        _save_artwork_cache()
+        futures = {
+            _ARTWORK_POOL.submit(_lookup_artwork, artist, title): key
+            for key, artist, title in uncached
+        }
+        for fut in as_completed(futures):
+            key = futures[fut]
+            try:
+                results[key] = fut.result()
+            except Exception:
+                results[key] = {"cover_url": "", "found": False}
+        _schedule_artwork_cache_save()
 
     resp = jsonify(results)
     resp.headers["Cache-Control"] = "public, max-age=86400"
@@ -2861,6 +3812,19 @@ _warm_cache_state = {
     "skipped": 0,       # already cached
 }
 
+def _artwork_pairs(df):
+    """Unique ``(cache_key, artist, title)`` triples for every track with
+    both fields set (vectorised; first occurrence of each key wins)."""
+    artist = df["artist"].fillna("").astype(str).str.strip()
+    title = df["title"].fillna("").astype(str).str.strip()
+    pairs = pd.DataFrame({
+        "key": artist.str.lower() + "||" + title.str.lower(),
+        "artist": artist,
+        "title": title,
+    })[(artist != "") & (title != "")].drop_duplicates("key")
+    return list(pairs.itertuples(index=False, name=None))
+
+
 def _warm_cache_worker():
     """Background thread: look up artwork for every track in the DataFrame."""
     st = _warm_cache_state
@@ -2870,21 +3834,12 @@ def _warm_cache_worker():
             st["running"] = False
             return
 
-        # Build unique (artist, title) pairs not yet cached or on disk
+        # Keep unique (artist, title) pairs not yet cached or on disk
         pairs = []
-        seen = set()
-        for _, row in df.iterrows():
-            artist = str(row.get("artist") or "").strip()
-            title = str(row.get("title") or "").strip()
-            if not artist or not title:
-                continue
-            key = f"{artist.lower()}||{title.lower()}"
-            if key in seen:
-                continue
-            seen.add(key)
+        on_disk = _artwork_files(max_age=0)
+        for key, artist, title in _artwork_pairs(df):
             # Skip if local file exists on disk
-            small_fname = _artwork_filename(key, "small")
-            if os.path.exists(os.path.join(_ARTWORK_DIR, small_fname)):
+            if _artwork_filename(key, "small") in on_disk:
                 st["skipped"] += 1
                 continue
             if key in _state["_artwork_cache"]:
@@ -2901,26 +3856,22 @@ def _warm_cache_worker():
             if not st["running"]:
                 break
             chunk = pairs[i:i + BATCH]
-            with ThreadPoolExecutor(max_workers=BATCH) as pool:
-                futures = {
-                    pool.submit(_lookup_artwork, artist, title): key
-                    for key, artist, title in chunk
-                }
-                for fut in as_completed(futures):
-                    key = futures[fut]
-                    try:
-                        result = fut.result()
-                        if result.get("cover_url"):
-                            st["found"] += 1
-                    except Exception:
-                        pass
-                    st["done"] += 1
-            # Save every 50 lookups and throttle
-            if (i // BATCH) % 6 == 5:
-                _save_artwork_cache()
-            time.sleep(0.3)                       # small delay between batches
+            futures = {
+                _ARTWORK_POOL.submit(_lookup_artwork, artist, title): key
+                for key, artist, title in chunk
+            }
+            for fut in as_completed(futures):
+                key = futures[fut]
+                try:
+                    result = fut.result()
+                    if result.get("cover_url"):
+                        st["found"] += 1
+                except Exception:
+                    pass
+                st["done"] += 1
+            _schedule_artwork_cache_save()
 
-        _save_artwork_cache()
+        _schedule_artwork_cache_save()
     except Exception:
         logging.exception("Artwork warm-cache failed")
     finally:
@@ -2946,43 +3897,70 @@ def warm_cache_status():
 def uncached_count():
     """Quick check: how many tracks have no cached artwork lookup or local file."""
     df = _state.get("df")
-    if df is None or "artist" not in df.columns:
+    if df is None or "artist" not in df.columns or "title" not in df.columns:
         return jsonify({"uncached": 0})
-    seen = set()
-    uncached = 0
-    for _, row in df.iterrows():
-        artist = str(row.get("artist") or "").strip()
-        title = str(row.get("title") or "").strip()
-        if not artist or not title:
-            continue
-        key = f"{artist.lower()}||{title.lower()}"
-        if key in seen:
-            continue
-        seen.add(key)
-        # Check disk first, then cache
-        small_fname = _artwork_filename(key, "small")
-        if os.path.exists(os.path.join(_ARTWORK_DIR, small_fname)):
-            continue
-        if key not in _state["_artwork_cache"]:
-            uncached += 1
-    return jsonify({"uncached": uncached, "total": len(seen)})
+    keys = {key for key, _, _ in _artwork_pairs(df)}
+    # Set math against one cache snapshot; only keys with no lookup at all
+    # need their filename hashed for the on-disk check.
+    missing = keys - _state["_artwork_cache"].keys()
+    on_disk = _artwork_files()
+    uncached = sum(1 for key in missing
+                   if _artwork_filename(key, "small") not in on_disk)
+    return jsonify({"uncached": uncached, "total": len(keys)})
 
 
 # ---------------------------------------------------------------------------
 # Serve local artwork files
 # ---------------------------------------------------------------------------
+_ARTWORK_ETAG_CACHE_MAX = 4096
+_artwork_etags = OrderedDict()     # (filename, mtime_ns, size) -> etag
+_artwork_etags_lock = threading.Lock()
+
+
+def _artwork_etag(filename, fpath, st):
+    """Strong content-hash ETag for an artwork file. Hashed once per file
+    version (name + mtime + size), then served from a small LRU."""
+    key = (filename, st.st_mtime_ns, st.st_size)
+    with _artwork_etags_lock:
+        etag = _artwork_etags.get(key)
+        if etag is not None:
+            _artwork_etags.move_to_end(key)
+            return etag
+    with open(fpath, "rb") as f:
+        etag = "b2-" + hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    with _artwork_etags_lock:
+        _artwork_etags[key] = etag
+        while len(_artwork_etags) > _ARTWORK_ETAG_CACHE_MAX:
+            _artwork_etags.popitem(last=False)
+    return etag
+
+
 @api.route("/artwork/<path:filename>")
 def serve_artwork(filename):
     """Serve locally-cached artwork images."""
+    if not _valid_artwork_filename(filename):
+        return jsonify({"error": "Invalid artwork filename"}), 400
     fpath = os.path.join(_ARTWORK_DIR, filename)
-    resp = send_file(fpath, mimetype="image/jpeg")
-    # Use file mtime as ETag so replaced images bust browser cache
+    # One stat answers existence, file type and the ETag key
     try:
-        mtime = int(os.path.getmtime(fpath))
-        resp.headers["ETag"] = f'"{mtime}"'
-        resp.headers["Cache-Control"] = "public, max-age=3600"  # 1h, revalidate via ETag
+        st = os.stat(fpath)
     except OSError:
-        pass
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return jsonify({"error": "Artwork not found"}), 404
+    # Content-hash ETag: stable across no-op touches, distinct for
+    # same-second rewrites
+    etag = _artwork_etag(filename, fpath, st)
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": "public, max-age=3600, must-revalidate",  # 1h, then revalidate
+    }
+    # Client already has this version: answer without touching the file
+    # (contains_weak handles W/ prefixes, lists and "*")
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    resp = send_file(fpath, mimetype="image/jpeg", etag=etag)
+    resp.headers.update(headers)
     return resp
 
 
@@ -3006,35 +3984,42 @@ def _download_all_worker():
         st["done"] = 0
         st["downloaded"] = 0
 
+        # Tracks from one album share a cover URL: fetch each URL once and
+        # link the file under every other track's name.
+        fetched = {}          # CDN url -> local /artwork/ URL
         BATCH = 12
         for i in range(0, len(entries), BATCH):
             if not st["running"]:
                 break
             chunk = entries[i:i + BATCH]
-            with ThreadPoolExecutor(max_workers=BATCH) as pool:
-                futures = []
-                for cache_key, entry in chunk:
-                    for field, size in [("cover_url", "small"), ("cover_big", "big")]:
-                        url = entry.get(field, "")
-                        if url and not url.startswith("/artwork/"):
-                            futures.append(
-                                pool.submit(_download_artwork_local, url, cache_key, size)
-                            )
-                for fut in as_completed(futures):
-                    result = fut.result()
-                    if result:
-                        st["downloaded"] += 1
+            by_url = {}
+            for cache_key, entry in chunk:
+                for field, size in [("cover_url", "small"), ("cover_big", "big")]:
+                    url = entry.get(field, "")
+                    if url and not url.startswith("/artwork/"):
+                        by_url.setdefault(url, []).append((cache_key, size))
+            futures = {
+                _ARTWORK_POOL.submit(_download_artwork_local, url, *targets[0]): url
+                for url, targets in by_url.items() if url not in fetched
+            }
+            for fut in as_completed(futures):
+                result = fut.result()
+                if result:
+                    fetched[futures[fut]] = result
+                    st["downloaded"] += 1
+            for url, targets in by_url.items():
+                if url in fetched:
+                    for cache_key, size in targets:
+                        _link_artwork_local(fetched[url], cache_key, size)
 
             # Update cache entries with local URLs
             for cache_key, entry in chunk:
                 _ensure_local_artwork(entry, cache_key)
                 st["done"] += 1
 
-            if (i // BATCH) % 10 == 9:
-                _save_artwork_cache()
-            time.sleep(0.1)
+            _schedule_artwork_cache_save()
 
-        _save_artwork_cache()
+        _schedule_artwork_cache_save()
     except Exception:
         logging.exception("Bulk artwork download failed")
     finally:
@@ -3199,87 +4184,116 @@ def set_workshop_refill_bpm():
 
     body = request.get_json() or {}
     slots = body.get("slots", [])
+    locations = df["location"] if "location" in df.columns else None
+
+    def check_audio(tracks):
+        tracks = [t for t in tracks if t]
+        locs = [str(locations.at[t["id"]]) if locations is not None else ""
+                for t in tracks]
+        prefetched = _prefetch_dropbox_exists(locs)
+        for t, loc in zip(tracks, locs):
+            t["has_audio"] = _check_has_audio(loc, prefetched)
 
     def generate():
         used_global = set()  # accumulate used tracks across slots
         total = len(slots)
         done = 0
+        # Selection stays sequential (each slot excludes tracks picked by
+        # earlier slots), but a slot's audio checks run in the background
+        # while later slots are selected; events still go out in slot order.
+        audio_pool = ThreadPoolExecutor(max_workers=4)
+        pending = deque()   # (audio-check future, event)
+
+        def flush(block):
+            while pending and (block or pending[0][0].done()):
+                future, event = pending.popleft()
+                try:
+                    future.result()
+                except Exception:
+                    logging.exception("Audio check failed during BPM refill")
+                yield b"data: " + _json_dumps(event) + b"\n\n"
 
-        for si, slot in enumerate(slots):
-            source = slot.get("source")
-            tracks = slot.get("tracks") or []
-            sel_idx = slot.get("selectedTrackIndex")
+        try:
+            for si, slot in enumerate(slots):
+                source = slot.get("source")
+                tracks = slot.get("tracks") or []
+                sel_idx = slot.get("selectedTrackIndex")
+
+                # Skip empty slots
+                if not source or not tracks or sel_idx is None:
+                    done += 1
+                    continue
 
-            # Skip empty slots
-            if not source or not tracks or sel_idx is None:
-                done += 1
-                continue
+                # Find anchor (the currently selected track)
+                anchor = tracks[sel_idx] if 0 <= sel_idx < len(tracks) and tracks[sel_idx] else None
+                if not anchor or anchor.get("id") is None:
+                    done += 1
+                    continue
 
-            # Find anchor (the currently selected track)
-            anchor = tracks[sel_idx] if 0 <= sel_idx < len(tracks) and tracks[sel_idx] else None
-            if not anchor or anchor.get("id") is None:
-                done += 1
-                continue
+                anchor_id = anchor["id"]
+                src_type = source.get("type", "adhoc")
+                src_id = source.get("id")
+                tree_type = source.get("tree_type", "genre")
+
+                tree = _resolve_tree(tree_type) if src_type == "tree_node" else None
+
+                # Resolve source track pool
+                if src_type in ("adhoc", "autoset"):
+                    pool_ids = [t["id"] for t in tracks if t and t.get("id") is not None]
+                    # Auto-expand single-track pool via collection leaf
+                    if len(pool_ids) <= 1:
+                        coll_tree = _resolve_tree("collection")
+                        leaf = find_leaf_for_track(coll_tree, anchor_id)
+                        if leaf:
+                            pool_ids = leaf.get("track_ids", pool_ids)
+                            src_type = "tree_node"
+                            src_id = leaf.get("id", "")
+                            tree_type = "collection"
+                            tree = coll_tree
+                else:
+                    pool_ids = get_source_tracks(src_type, src_id, tree)
+
+                if not pool_ids:
+                    done += 1
+                    continue
 
-            anchor_id = anchor["id"]
-            src_type = source.get("type", "adhoc")
-            src_id = source.get("id")
-            tree_type = source.get("tree_type", "genre")
-
-            tree = _resolve_tree(tree_type) if src_type == "tree_node" else None
-
-            # Resolve source track pool
-            if src_type in ("adhoc", "autoset"):
-                pool_ids = [t["id"] for t in tracks if t and t.get("id") is not None]
-                # Auto-expand single-track pool via collection leaf
-                if len(pool_ids) <= 1:
-                    coll_tree = _resolve_tree("collection")
-                    leaf = find_leaf_for_track(coll_tree, anchor_id)
-                    if leaf:
-                        pool_ids = leaf.get("track_ids", pool_ids)
-                        src_type = "tree_node"
-                        src_id = leaf.get("id", "")
-                        tree_type = "collection"
-                        tree = coll_tree
-            else:
-                pool_ids = get_source_tracks(src_type, src_id, tree)
+                # has_audio is filled in by check_audio below
+                new_tracks = select_tracks_for_source(
+                    df, pool_ids,
+                    used_track_ids=used_global,
+                    anchor_track_id=anchor_id,
+                    has_audio_fn=no_audio_check,
+                )
+
+                # Track used IDs to avoid duplicates across slots
+                for t in new_tracks:
+                    if t and t.get("id") is not None:
+                        used_global.add(t["id"])
+
+                # Build source info
+                if src_type == "adhoc":
+                    info = {"id": src_id, "name": source.get("name", "Ad-hoc"),
+                            "type": src_type, "tree_type": tree_type}
+                else:
+                    info = get_source_info(src_type, src_id, tree) or {}
+                    info["type"] = src_type
+                    info["tree_type"] = tree_type
 
-            if not pool_ids:
                 done += 1
-                continue
-
-            new_tracks = select_tracks_for_source(
-                df, pool_ids,
-                used_track_ids=used_global,
-                anchor_track_id=anchor_id,
-                has_audio_fn=_check_has_audio,
-            )
-
-            # Track used IDs to avoid duplicates across slots
-            for t in new_tracks:
-                if t and t.get("id") is not None:
-                    used_global.add(t["id"])
-
-            # Build source info
-            if src_type == "adhoc":
-                info = {"id": src_id, "name": source.get("name", "Ad-hoc"),
-                        "type": src_type, "tree_type": tree_type}
-            else:
-                info = get_source_info(src_type, src_id, tree) or {}
-                info["type"] = src_type
-                info["tree_type"] = tree_type
-
-            done += 1
-            event = json.dumps({
-                "slot_index": si,
-                "source": info,
-                "tracks": new_tracks,
-                "progress": done,
-                "total": total,
-            })
-            yield f"data: {event}\n\n"
+                pending.append((audio_pool.submit(check_audio, new_tracks), {
+                    "slot_index": si,
+                    "source": info,
+                    "tracks": new_tracks,
+                    "progress": done,
+                    "total": total,
+                }))
+                yield from flush(block=False)
+
+            yield from flush(block=True)
+        finally:
+            audio_pool.shutdown(wait=False, cancel_futures=True)
 
-        yield "data: {\"done\": true}\n\n"
+        yield b'data: {"done": true}\n\n'
 
     return Response(generate(), mimetype="text/event-stream",
                     headers={"Cache-Control": "no-cache",
@@ -3298,8 +4312,14 @@ def set_workshop_source_detail():
     tree_type = request.args.get("tree_type", "genre")
 
     tree = _resolve_tree(tree_type) if source_type == "tree_node" else None
-    detail = get_source_detail(df, source_type, source_id, tree,
-                               has_audio_fn=_check_has_audio)
+    prefetched = {}
+    if "location" in df.columns:
+        ids = df.index.intersection(
+            get_source_tracks(source_type, source_id, tree))
+        prefetched = _prefetch_dropbox_exists(df.loc[ids, "location"].tolist())
+    detail = get_source_detail(
+        df, source_type, source_id, tree,
+        has_audio_fn=functools.partial(_check_has_audio, prefetched=prefetched))
     if not detail:
         return jsonify({"error": "Source not found"}), 404
 
@@ -3319,15 +4339,12 @@ def set_workshop_track_search():
         return jsonify({"tracks": [], "count": 0})
 
     q_lower = query.lower()
-    matches = []
-    for idx in df.index:
-        row = df.loc[idx]
-        title = str(row.get("title", "")).lower()
-        artist = str(row.get("artist", "")).lower()
-        if q_lower in title or q_lower in artist:
-            matches.append(idx)
-        if len(matches) >= 50:
-            break
+    hit = pd.Series(False, index=df.index)
+    for col in ("title", "artist"):
+        if col in df.columns:
+            hit |= df[col].astype(str).str.lower().str.contains(
+                q_lower, regex=False, na=False)
+    matches = df.index[hit][:50].tolist()
 
     tracks = _tracks_from_ids(df, matches)
     return jsonify({"tracks": tracks, "count": len(tracks)})
@@ -3352,17 +4369,13 @@ def set_workshop_artist_tracks(track_id):
     artists = re.split(r'\s*[,&]\s*|\s+feat\.?\s+|\s+ft\.?\s+|\s+vs\.?\s+', artist_str, flags=re.IGNORECASE)
     artists = [a.strip().lower() for a in artists if a.strip()]
 
-    matches = set()
-    for idx in df.index:
-        if idx == track_id:
-            continue
-        row_artist = str(df.loc[idx].get("artist", "")).lower()
-        for a in artists:
-            if a in row_artist:
-                matches.add(idx)
-                break
+    row_artists = df["artist"].astype(str).str.lower()
+    hit = pd.Series(False, index=df.index)
+    for a in artists:
+        hit |= row_artists.str.contains(a, regex=False, na=False)
+    matches = df.index[hit & (df.index != track_id)]
 
-    tracks = _tracks_from_ids(df, sorted(matches))
+    tracks = _tracks_from_ids(df, sorted(matches.tolist()))
     return jsonify({"tracks": tracks})
 
 
@@ -3394,10 +4407,11 @@ def set_workshop_track_narrative(track_id):
     if track_id not in df.index:
         return jsonify({"error": "Track not found"}), 404
 
+    epoch = _df_epoch
+
     # Check for cached narrative in DataFrame
-    if "_track_narrative" not in df.columns:
-        df["_track_narrative"] = ""
-    existing = df.at[track_id, "_track_narrative"]
+    existing = (df.at[track_id, "_track_narrative"]
+                if "_track_narrative" in df.columns else "")
     if existing and str(existing).strip() and str(existing) != "nan":
         return jsonify({"narrative": str(existing)})
 
@@ -3451,8 +4465,13 @@ def set_workshop_track_narrative(track_id):
             narrative = resp.choices[0].message.content.strip()
 
         # Persist to DataFrame and autosave
-        df.at[track_id, "_track_narrative"] = narrative
-        _autosave()
+        def store_narrative(d):
+            if "_track_narrative" not in d.columns:
+                d["_track_narrative"] = ""
+            d.at[track_id, "_track_narrative"] = narrative
+
+        _update_df(store_narrative, epoch=epoch)
+        _schedule_autosave()
         return jsonify({"narrative": narrative})
     except Exception as e:
         logging.exception(f"Track narrative LLM error for {track_id}")
@@ -3463,8 +4482,8 @@ def set_workshop_track_narrative(track_id):
 def set_workshop_check_audio():
     """Check which track IDs have playable audio (Dropbox or local).
 
-    Parallelises Dropbox metadata checks (up to 10 concurrent) so a batch
-    of ~200 tracks completes in seconds rather than minutes.
+    Uncached Dropbox paths are resolved in one concurrent batch up front,
+    so a batch of ~200 tracks completes in seconds rather than minutes.
     """
     df = _state["df"]
     if df is None:
@@ -3473,6 +4492,7 @@ def set_workshop_check_audio():
     track_ids = body.get("track_ids", [])
 
     # Build work items: (str_id, raw_location)
+    locations = df["location"] if "location" in df.columns else None
     work = []
     result = {}
     for tid in track_ids:
@@ -3480,21 +4500,15 @@ def set_workshop_check_audio():
         if tid not in df.index:
             result[str(tid)] = False
             continue
-        raw_loc = str(df.loc[tid].get("location", ""))
+        raw_loc = str(locations.at[tid]) if locations is not None else ""
         work.append((str(tid), raw_loc))
 
-    # Run checks in parallel (I/O-bound Dropbox calls benefit from threads)
-    with ThreadPoolExecutor(max_workers=10) as pool:
-        futures = {
-            pool.submit(_check_has_audio, loc): str_id
-            for str_id, loc in work
-        }
-        for future in as_completed(futures):
-            str_id = futures[future]
-            try:
-                result[str_id] = future.result()
-            except Exception:
-                result[str_id] = False
+    prefetched = _prefetch_dropbox_exists(loc for _, loc in work)
+    for str_id, loc in work:
+        try:
+            result[str_id] = _check_has_audio(loc, prefetched)
+        except Exception:
+            result[str_id] = False
 
     return jsonify(result)
 
@@ -3522,13 +4536,18 @@ def set_workshop_track_nexts(track_id):
     src_bpm_val = float(src_bpm) if src_bpm is not None and not _is_nan(src_bpm) else None
     src_comment = str(row.get("comment", "")).lower()
 
+    # Walk plain column lists instead of building a Series per row
+    def column(name, default):
+        if name in df.columns:
+            return df[name].tolist()
+        return [default] * len(df)
+
     candidates = []
-    for idx in df.index:
+    for idx, key, bpm, cmt in zip(df.index.tolist(), column("key", ""),
+                                  column("bpm", None), column("comment", "")):
         if idx == track_id:
             continue
-        r = df.loc[idx]
-        key = _sv(r.get("key", ""))
-        bpm = r.get("bpm")
+        key = _sv(key)
         bpm_val = float(bpm) if bpm is not None and not _is_nan(bpm) else None
 
         # Key filter: must be Camelot-compatible
@@ -3545,31 +4564,30 @@ def set_workshop_track_nexts(track_id):
         score = key_dist * 10 + bpm_diff
 
         # Genre overlap bonus (subtract from score)
-        cmt = str(r.get("comment", "")).lower()
+        cmt = str(cmt).lower()
         if src_comment and cmt:
             src_genres = set(src_comment.split(";")[0:2])
             trk_genres = set(cmt.split(";")[0:2])
             overlap = len(src_genres & trk_genres)
             score -= overlap * 5
 
-        candidates.append((score, idx))
+        candidates.append((score, idx, bpm_val))
 
     candidates.sort(key=lambda x: x[0])
     top = candidates[:20]
 
+    rows = _track_records(df, [idx for _, idx, _ in top])
     tracks = []
-    for score, idx in top:
-        r = df.loc[idx]
-        bpm = r.get("bpm")
-        bpm_val = round(float(bpm), 1) if bpm is not None and not _is_nan(bpm) else None
+    for score, idx, bpm_val in top:
+        r = rows.get(idx, {})
         tracks.append({
             "id": int(idx),
-            "title": _safe_val(r.get("title", "")),
-            "artist": _safe_val(r.get("artist", "")),
-            "bpm": bpm_val,
-            "key": _safe_val(r.get("key", "")),
-            "year": _safe_val(r.get("year", "")),
-            "comment": _safe_val(r.get("comment", "")),
+            "title": r.get("title", ""),
+            "artist": r.get("artist", ""),
+            "bpm": round(bpm_val, 1) if bpm_val is not None else None,
+            "key": r.get("key", ""),
+            "year": r.get("year", ""),
+            "comment": r.get("comment", ""),
             "score": round(score, 1),
         })
 
@@ -3606,24 +4624,8 @@ def set_workshop_export_m3u():
     slot_selections = body.get("slots", [])
     set_name = body.get("name", "DJ_Set")
 
-    lines = ["#EXTM3U", f"#PLAYLIST:{set_name}"]
-    for slot in slot_selections:
-        tid = slot.get("track_id")
-        if tid is None or tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {title}")
-        if location and location != "nan":
-            lines.append(location)
-
-    content = "\n".join(lines) + "\n"
-    safe_name = set_name.replace(" ", "_")
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{safe_name}.m3u8")
+    track_ids = [slot.get("track_id") for slot in slot_selections]
+    return _m3u_download(df, [t for t in track_ids if t is not None], set_name)
 
 
 # ---------------------------------------------------------------------------
@@ -3740,29 +4742,17 @@ def saved_sets_export_m3u(set_id):
         return jsonify({"error": "Set not found"}), 404
 
     set_name = s.get("name", "DJ_Set")
-    lines = ["#EXTM3U", f"#PLAYLIST:{set_name}"]
-
+    track_ids = []
     for slot in s.get("slots", []):
         idx = slot.get("selectedTrackIndex")
         tracks = slot.get("tracks") or []
         if idx is None or idx >= len(tracks) or tracks[idx] is None:
             continue
         tid = tracks[idx].get("id")
-        if tid is None or tid not in df.index:
-            continue
-        row = df.loc[tid]
-        artist = str(row.get("artist", "Unknown"))
-        title = str(row.get("title", "Unknown"))
-        location = str(row.get("location", ""))
-        lines.append(f"#EXTINF:-1,{artist} - {title}")
-        if location and location != "nan":
-            lines.append(location)
+        if tid is not None:
+            track_ids.append(tid)
 
-    content = "\n".join(lines) + "\n"
-    safe_name = set_name.replace(" ", "_")
-    buf = io.BytesIO(content.encode("utf-8"))
-    return send_file(buf, mimetype="audio/x-mpegurl", as_attachment=True,
-                     download_name=f"{safe_name}.m3u8")
+    return _m3u_download(df, track_ids, set_name)
 
 
 # ---------------------------------------------------------------------------
@@ -3893,7 +4883,9 @@ def dropbox_callback():
 
     _state["_dropbox_refresh_token"] = result.refresh_token
     _state["_dropbox_account_id"] = result.account_id
-    _state["_dropbox_exists_cache"] = {}
+    _state["_dropbox_exists_cache"] = _TTLCache(_DROPBOX_EXISTS_MAX,
+                                                _DROPBOX_EXISTS_TTL)
+    _dropbox_link_failures.clear()
     _init_dropbox_client(result.refresh_token)
     _save_dropbox_tokens()
     logging.info("Dropbox connected: account_id=%s", result.account_id)
@@ -3911,7 +4903,9 @@ def dropbox_disconnect():
     _state["_dropbox_client"] = None
     _state["_dropbox_refresh_token"] = None
     _state["_dropbox_account_id"] = None
-    _state["_dropbox_exists_cache"] = {}
+    _state["_dropbox_tokens_saved"] = None
+    _state["_dropbox_exists_cache"] = _TTLCache(_DROPBOX_EXISTS_MAX,
+                                                _DROPBOX_EXISTS_TTL)
     try:
         if os.path.exists(_DROPBOX_TOKENS_FILE):
             os.remove(_DROPBOX_TOKENS_FILE)
@@ -3960,31 +4954,37 @@ def serve_audio(track_id):
     if track_id not in df.index:
         return jsonify({"error": "Track not found"}), 404
 
-    raw_location = str(df.loc[track_id].get("location", ""))
+    # Scalar .at lookup: no Series built for the whole row on every request
+    raw_location = str(df.at[track_id, "location"]) if "location" in df.columns else ""
+    dropbox_path, location = _audio_paths(raw_location)
 
     # Try Dropbox first
     dbx = _state.get("_dropbox_client")
     if dbx:
-        dropbox_path = _to_dropbox_path(raw_location)
-        if dropbox_path:
+        if dropbox_path and dropbox_path not in _dropbox_link_failures:
             try:
-                result = dbx.files_get_temporary_link(dropbox_path)
-                return redirect(result.link, 302)
+                return redirect(_dropbox_temp_link(dbx, dropbox_path), 302)
             except dropbox.exceptions.ApiError as e:
                 logging.warning("Dropbox temp link failed for %s: %s",
                                 dropbox_path, e)
+                _dropbox_link_failures[dropbox_path] = True
             except Exception as e:
                 logging.warning("Dropbox error for %s: %s", dropbox_path, e)
+                _dropbox_link_failures[dropbox_path] = True
 
     # Fall back to local file
-    location = _map_audio_path(raw_location)
     if not location or location == "nan":
         return jsonify({"error": "No file path for this track"}), 404
-    if not os.path.isfile(location):
+    try:
+        is_file = stat.S_ISREG(os.stat(location).st_mode)
+    except OSError:
+        is_file = False
+    if not is_file:
         return jsonify({"error": "Audio file not found"}), 404
 
     ext = os.path.splitext(location)[1].lower()
     mimetype = _AUDIO_MIME.get(ext, "application/octet-stream")
+    # conditional=True answers Range requests with 206 + Content-Range
     return send_file(location, mimetype=mimetype, conditional=True)
 
 
@@ -4007,8 +5007,8 @@ def autoset_build():
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    t = _state.get("autoset_thread")
-    if t and t.is_alive():
+    job = _state.get("autoset_job")
+    if job and not job.done():
         return jsonify({"error": "Auto Set build already in progress"}), 409
 
     body = request.get_json(force=True)
@@ -4020,6 +5020,14 @@ def autoset_build():
     if not source_type or not source_id:
         return jsonify({"error": "source_type and source_id required"}), 400
 
+    # Gather available trees for context; tree_node sources index into this
+    # rather than loading their tree a second time. Cold loads of the three
+    # files overlap their disk reads on a short-lived pool.
+    names = ("genre", "scene", "collection")
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        loaded = pool.map(_resolve_tree, names)
+    trees = {name: tree for name, tree in zip(names, loaded) if tree}
+
     # Resolve track IDs from source
     track_ids = []
     if source_type == "playlist":
@@ -4032,15 +5040,8 @@ def autoset_build():
             set_name = pl.get("name", source_id)
     elif source_type == "tree_node":
         tree_type = body.get("tree_type", "collection")
-        tree = None
-        if tree_type == "collection":
-            tree = _state.get("collection_tree") or load_tree(
-                file_path=_COLLECTION_TREE_FILE)
-        elif tree_type == "scene":
-            tree = _state.get("scene_tree") or load_tree(
-                file_path=TREE_PROFILES["scene"]["file"])
-        else:
-            tree = _state.get("tree") or load_tree()
+        tree = trees.get(tree_type if tree_type in ("collection", "scene")
+                         else "genre")
 
         if not tree:
             return jsonify({"error": f"{tree_type} tree not found"}), 404
@@ -4057,20 +5058,6 @@ def autoset_build():
     if len(track_ids) < 10:
         return jsonify({"error": f"Need at least 10 tracks, got {len(track_ids)}"}), 400
 
-    # Gather available trees for context
-    trees = {}
-    genre_tree = _state.get("tree") or load_tree()
-    if genre_tree:
-        trees["genre"] = genre_tree
-    scene_tree = _state.get("scene_tree") or load_tree(
-        file_path=TREE_PROFILES["scene"]["file"])
-    if scene_tree:
-        trees["scene"] = scene_tree
-    collection_tree = _state.get("collection_tree") or load_tree(
-        file_path=_COLLECTION_TREE_FILE)
-    if collection_tree:
-        trees["collection"] = collection_tree
-
     # Load model config
     config = load_config()
     model_config = {
@@ -4123,9 +5110,7 @@ def autoset_build():
                 "detail": str(e), "percent": 0,
             })
 
-    thread = threading.Thread(target=worker, daemon=True)
-    _state["autoset_thread"] = thread
-    thread.start()
+    _state["autoset_job"] = _submit_bg(worker)
 
     return jsonify({"started": True, "track_count": len(track_ids)}), 202
 
@@ -4136,7 +5121,6 @@ def autoset_build():
 
 @api.route("/api/autoset/progress")
 def autoset_progress():
-    import queue
     q = queue.Queue(maxsize=100)
     _state["autoset_progress_listeners"].append(q)
 
@@ -4144,12 +5128,12 @@ def autoset_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"
+                    yield b":\n\n"
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "error", "stopped"):
+                yield payload
+                if event in ("done", "error", "stopped"):
                     break
         finally:
             if q in _state["autoset_progress_listeners"]:
@@ -4180,7 +5164,7 @@ def autoset_result():
     if not result:
         return jsonify({"error": "No result available"}), 404
     # Return the full result (narrative, acts, tracklist, set info)
-    return jsonify({
+    return _json_response({
         "narrative": result.get("narrative", ""),
         "acts": result.get("acts", []),
         "ordered_tracks": result.get("ordered_tracks", []),
@@ -4207,8 +5191,8 @@ def chat_message():
     if df is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    t = _state.get("chat_thread")
-    if t and t.is_alive():
+    job = _state.get("chat_job")
+    if job and not job.done():
         return jsonify({"error": "Chat request already in progress"}), 409
 
     body = request.get_json(force=True)
@@ -4219,11 +5203,7 @@ def chat_message():
     _state["chat_stop_flag"].clear()
 
     def broadcast(data):
-        for q in list(_state["chat_progress_listeners"]):
-            try:
-                q.put_nowait(data)
-            except Exception:
-                pass
+        _fan_out(_state["chat_progress_listeners"], data)
 
     def worker():
         try:
@@ -4237,16 +5217,13 @@ def chat_message():
             logging.exception("Chat turn failed")
             broadcast({"event": "error", "detail": str(e)})
 
-    thread = threading.Thread(target=worker, daemon=True)
-    _state["chat_thread"] = thread
-    thread.start()
+    _state["chat_job"] = _submit_bg(worker)
     return jsonify({"started": True}), 202
 
 
 # GET /api/chat/progress — SSE stream
 @api.route("/api/chat/progress")
 def chat_progress():
-    import queue
     q = queue.Queue(maxsize=500)
     _state["chat_progress_listeners"].append(q)
 
@@ -4254,12 +5231,12 @@ def chat_progress():
         try:
             while True:
                 try:
-                    data = q.get(timeout=30)
+                    event, payload = q.get(timeout=30)
                 except queue.Empty:
-                    yield ":\n\n"  # keep-alive
+                    yield b":\n\n"  # keep-alive
                     continue
-                yield f"data: {json.dumps(data)}\n\n"
-                if data.get("event") in ("done", "error", "stopped"):
+                yield payload
+                if event in ("done", "error", "stopped"):
                     break
         finally:
             if q in _state["chat_progress_listeners"]:
@@ -4273,9 +5250,21 @@ def chat_progress():
 # GET /api/chat/history — return conversation for UI restore
 @api.route("/api/chat/history")
 def chat_history():
+    # chat_rev is monotonic across appends and clears, unlike object ids,
+    # which CPython reuses once a cleared conversation is freed. Writers
+    # change the list before bumping it, so reading it first means a racing
+    # write can only lag the tag, never reuse one for other contents.
+    rev = _state.get("chat_rev", 0)
     history = _state.get("chat_history", [])
-    messages = simplify_history_for_frontend(history)
-    return jsonify({"messages": messages})
+    etag = f"{rev}-{len(history)}"
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        messages = simplify_history_for_frontend(history)
+        resp = _json_response({"messages": messages})
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 
 # POST /api/chat/clear — reset conversation
@@ -4283,6 +5272,7 @@ def chat_history():
 def chat_clear():
     _state["chat_stop_flag"].set()
     _state["chat_history"] = []
+    _state["chat_rev"] = _state.get("chat_rev", 0) + 1
     return jsonify({"cleared": True})
 
 
@@ -4312,20 +5302,22 @@ def library_duplicates():
 
     # Build JSON-safe preview
     preview = []
+    rows = _track_records(
+        df, [idx for pick in picks for idx in [pick["winner"]] + pick["losers"]])
     for pick in picks:
         group_tracks = []
         all_ids = [pick["winner"]] + pick["losers"]
         for idx in all_ids:
-            row = df.loc[idx]
+            row = rows[idx]
             group_tracks.append({
                 "id": int(idx),
-                "artist": _safe_val(row.get("artist", "")),
-                "title": _safe_val(row.get("title", "")),
-                "comment": _safe_val(row.get("comment", "")),
-                "location": _safe_val(row.get("location", "")),
-                "bpm": _safe_val(row.get("bpm", "")),
-                "key": _safe_val(row.get("key", "")),
-                "year": _safe_val(row.get("year", "")),
+                "artist": row.get("artist", ""),
+                "title": row.get("title", ""),
+                "comment": row.get("comment", ""),
+                "location": row.get("location", ""),
+                "bpm": row.get("bpm", ""),
+                "key": row.get("key", ""),
+                "year": row.get("year", ""),
                 "is_winner": idx == pick["winner"],
             })
         preview.append({
@@ -4373,9 +5365,9 @@ def library_deduplicate():
         return jsonify({"status": "no_duplicates", "removed": 0})
 
     # Update in-memory state
-    _state["df"] = result["new_df"]
+    _publish_df(result["new_df"])
     _state["_analysis_cache"] = None
-    _state["_chord_cache"] = None
+    _state["_chord_cache"] = OrderedDict()
     _state["_preview_cache"] = {}
 
     # Save updated CSV
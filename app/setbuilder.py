@@ -6,7 +6,9 @@ import os
 import random
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from app.config import OUTPUT_DIR
 from app.tree import find_node
 from app.playlist import get_playlist, list_playlists
 from app.parser import scored_search, parse_all_comments
@@ -15,7 +17,7 @@ from app.parser import scored_search, parse_all_comments
 # State Persistence (working copy — crash recovery)
 # ---------------------------------------------------------------------------
 
-_SET_STATE_FILE = os.path.join("output", "set_workshop_state.json")
+_SET_STATE_FILE = os.path.join(OUTPUT_DIR, "set_workshop_state.json")
 
 
 def save_set_state(state):
@@ -40,7 +42,7 @@ def load_set_state():
 # Saved Sets Persistence (named sets — mirrors playlist.py CRUD pattern)
 # ---------------------------------------------------------------------------
 
-_SAVED_SETS_FILE = os.path.join("output", "saved_sets.json")
+_SAVED_SETS_FILE = os.path.join(OUTPUT_DIR, "saved_sets.json")
 _saved_sets: dict = {}
 
 
@@ -283,6 +285,11 @@ def _sv(val):
     return val
 
 
+def no_audio_check(location):
+    """``has_audio_fn`` for callers that fill in ``has_audio`` themselves."""
+    return False
+
+
 def _track_dict(df, idx, bpm_level=None, path_mapper=None, has_audio_fn=None):
     """Build a JSON-safe track dict from a DataFrame row."""
     if idx not in df.index:
@@ -516,16 +523,18 @@ def select_tracks_for_source(df, source_track_ids, bpm_levels=None,
     parse_all_comments(df)  # Ensure facet columns exist (idempotent)
 
     # Build pool of available tracks with their BPMs
+    anchor_int = int(anchor_track_id) if anchor_track_id is not None else None
+    ids = [idx for idx in source_track_ids
+           # Always keep the anchor track even if used in another slot
+           if (idx not in used_track_ids
+               or (anchor_int is not None and int(idx) == anchor_int))
+           and idx in df.index]
+    # One column gather instead of a row Series per id
+    bpms = (df["bpm"].loc[ids].tolist() if "bpm" in df.columns
+            else [None] * len(ids))
     pool = []          # [(track_id, bpm_float)]
     pool_id_set = set()
-    for idx in source_track_ids:
-        if idx in used_track_ids:
-            # Always keep the anchor track even if used in another slot
-            if anchor_track_id is None or int(idx) != int(anchor_track_id):
-                continue
-        if idx not in df.index:
-            continue
-        bpm = df.loc[idx].get("bpm")
+    for idx, bpm in zip(ids, bpms):
         if bpm is not None and not _is_nan(bpm):
             tid = int(idx)
             pool.append((tid, float(bpm)))
@@ -573,17 +582,18 @@ def select_tracks_for_source(df, source_track_ids, bpm_levels=None,
             used_in_slot.add(picked)
 
     # Build result list aligned to bpm_levels
-    result = []
-    for level in bpm_levels:
+    def build(level):
         tid = assigned.get(level)
-        if tid is not None:
-            result.append(_track_dict(df, tid, bpm_level=level,
-                                      path_mapper=path_mapper,
-                                      has_audio_fn=has_audio_fn))
-        else:
-            result.append(None)
+        if tid is None:
+            return None
+        return _track_dict(df, tid, bpm_level=level, path_mapper=path_mapper,
+                           has_audio_fn=has_audio_fn)
 
-    return result
+    if has_audio_fn and has_audio_fn is not no_audio_check and len(assigned) > 1:
+        # has_audio_fn may be a network round-trip (Dropbox) per track
+        with ThreadPoolExecutor(max_workers=len(assigned)) as pool:
+            return list(pool.map(build, bpm_levels))
+    return [build(level) for level in bpm_levels]
 
 
 # ---------------------------------------------------------------------------
@@ -666,27 +676,45 @@ def get_source_detail(df, source_type, source_id, tree=None, path_mapper=None,
 # Track Search & Context (for drawer search mode)
 # ---------------------------------------------------------------------------
 
+# (tree, leaf signature, track_id -> [leaves in tree order]) for the last
+# collection tree seen. The signature (identity and length of each leaf's
+# track_ids) is cheap to recompute and catches leaves edited in place.
+_leaf_index_memo = (None, None, {})
+
+
+def _leaf_index(tree):
+    """Reverse track_id -> leaves index for a collection tree, memoised."""
+    global _leaf_index_memo
+    leaves = [leaf for category in tree.get("categories", [])
+              for leaf in category.get("leaves", [])]
+    sig = tuple((id(leaf.get("track_ids")), len(leaf.get("track_ids", [])))
+                for leaf in leaves)
+    memo_tree, memo_sig, index = _leaf_index_memo
+    if memo_tree is tree and memo_sig == sig:
+        return index
+    index = {}
+    for leaf in leaves:
+        for tid in leaf.get("track_ids", []):
+            hits = index.setdefault(tid, [])
+            if not hits or hits[-1] is not leaf:
+                hits.append(leaf)
+    _leaf_index_memo = (tree, sig, index)
+    return index
+
+
 def find_leaf_for_track(tree, track_id):
     """Return the collection leaf whose track_ids contains track_id, or None."""
     if not tree:
         return None
-    for category in tree.get("categories", []):
-        for leaf in category.get("leaves", []):
-            if track_id in leaf.get("track_ids", []):
-                return leaf
-    return None
+    hits = _leaf_index(tree).get(track_id)
+    return hits[0] if hits else None
 
 
 def find_all_leaves_for_track(tree, track_id):
     """Return ALL collection leaves containing track_id."""
     if not tree:
         return []
-    results = []
-    for category in tree.get("categories", []):
-        for leaf in category.get("leaves", []):
-            if track_id in leaf.get("track_ids", []):
-                results.append(leaf)
-    return results
+    return list(_leaf_index(tree).get(track_id, ()))
 
 
 def build_track_context(df, track_id, collection_tree):
@@ -11,6 +11,7 @@ from datetime import datetime, timezone
 import pandas as pd
 from tenacity import retry, wait_fixed, stop_after_attempt, retry_if_exception_type
 
+from app.config import OUTPUT_DIR
 from app.parser import (
     parse_all_comments, build_genre_landscape_summary, scored_search,
 )
@@ -21,9 +22,18 @@ logger = logging.getLogger(__name__)
 # Persistence
 # ---------------------------------------------------------------------------
 
-_TREE_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "collection_tree.json"
-)
+_TREE_FILE = os.path.join(OUTPUT_DIR, "collection_tree.json")
+
+
+# Parsed trees keyed by path -> ((mtime_ns, size), tree). Repeated loads of
+# an unchanged file (Auto Set builds, set-workshop lookups) skip the JSON
+# parse; any write to the file changes its stat key and forces a re-read.
+_tree_cache = {}
+
+
+def _stat_key(fp):
+    st = os.stat(fp)
+    return st.st_mtime_ns, st.st_size
 
 
 def save_tree(tree, file_path=None):
@@ -31,21 +41,30 @@ def save_tree(tree, file_path=None):
     os.makedirs(os.path.dirname(fp), exist_ok=True)
     with open(fp, "w") as f:
         json.dump(tree, f, indent=2)
+    _tree_cache[fp] = (_stat_key(fp), tree)
 
 
 def load_tree(file_path=None):
     fp = file_path or _TREE_FILE
-    if os.path.exists(fp):
-        try:
-            with open(fp) as f:
-                return json.load(f)
-        except Exception:
-            return None
-    return None
+    try:
+        key = _stat_key(fp)
+    except OSError:
+        return None
+    hit = _tree_cache.get(fp)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    try:
+        with open(fp) as f:
+            tree = json.load(f)
+    except Exception:
+        return None
+    _tree_cache[fp] = (key, tree)
+    return tree
 
 
 def delete_tree(file_path=None):
     fp = file_path or _TREE_FILE
+    _tree_cache.pop(fp, None)
     if os.path.exists(fp):
         os.remove(fp)
         return True
@@ -455,10 +474,7 @@ TREE_PROFILES = {
         "subdivision_threshold": 40,
         "max_depth": 4,
         "leaf_batch_size": 5,
-        "file": os.path.join(
-            os.path.dirname(os.path.dirname(__file__)),
-            "output", "scene_tree.json",
-        ),
+        "file": os.path.join(OUTPUT_DIR, "scene_tree.json"),
     },
 }
 
@@ -1314,12 +1330,8 @@ def _find_in_subtree(node, node_id):
 # Collection Tree — curated cross-reference of Genre + Scene trees
 # ===========================================================================
 
-_COLLECTION_TREE_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "curated_collection.json"
-)
-_COLLECTION_CHECKPOINT_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "output", "collection_checkpoint.json"
-)
+_COLLECTION_TREE_FILE = os.path.join(OUTPUT_DIR, "curated_collection.json")
+_COLLECTION_CHECKPOINT_FILE = os.path.join(OUTPUT_DIR, "collection_checkpoint.json")
 
 
 def _save_checkpoint(phase_completed, data):